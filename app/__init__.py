@@ -4,14 +4,11 @@ from contextlib import asynccontextmanager
 
 import dotenv
 from fastapi import FastAPI
-from sqlmodel import SQLModel
 from starlette.middleware.cors import CORSMiddleware
 
-from .artifact_manager import DXMTArtifactManager
-from .github import GitHubAPIClient
-from .router import router, artifact_router, build_router
-from .syncer import ArtifactSyncer
-from .utils import engine, get_bucket_name, get_endpoint_url
+from .artifact_manager import close_upload_services
+from .startup import StartupState, warm_up
+from .router import router, artifact_router, build_router, admin_router, source_router, source_artifact_router, source_build_router
 
 dotenv.load_dotenv(dotenv.find_dotenv())
 
@@ -20,19 +17,16 @@ logging.basicConfig(level=logging.INFO)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables
-    SQLModel.metadata.create_all(engine)
-
-    # Start syncer in background
-    github_client = GitHubAPIClient()
-    syncer = ArtifactSyncer(github_client, engine, get_bucket_name())
-
-    task = asyncio.create_task(syncer.sync_loop())
+    # Migrate, warm caches and then start the syncer in background; the server accepts
+    # connections immediately and reports readiness on /health/ready
+    app.state.startup = StartupState()
+    task = asyncio.create_task(warm_up(app))
 
     yield
 
     # Cleanup
     task.cancel()
+    await asyncio.to_thread(close_upload_services)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -48,3 +42,7 @@ app.add_middleware(
 app.include_router(router)
 app.include_router(artifact_router)
 app.include_router(build_router)
+app.include_router(admin_router)
+app.include_router(source_router)
+app.include_router(source_artifact_router)
+app.include_router(source_build_router)
@@ -1,11 +1,108 @@
+import threading
+from functools import lru_cache
+from pathlib import Path
 from sqlmodel import Session, select, col
-from typing import List, Union, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union, Optional
 from sqlalchemy import literal, cast, String, union_all, text
 from sqlalchemy.orm import selectinload
-import boto3
+
+# boto3 takes a large share of the app's import time, it is imported when the first client is created
+if TYPE_CHECKING:
+    from boto3.s3.transfer import TransferConfig
 
 
 from .models.builds import BuiltinBuild, ReleaseBuild, BuiltinArtifact, ReleaseArtifact
+from .models.sources import DEFAULT_SOURCE
+from .utils import (
+    get_s3_checksum_algorithm, get_s3_max_concurrency, get_s3_max_pool_connections, get_s3_multipart_chunksize,
+    get_s3_multipart_threshold,
+)
+
+
+@lru_cache
+def get_s3_client(endpoint_url: Optional[str] = None):
+    # boto3 clients are thread safe; sharing one keeps its connection pool warm across requests
+    import boto3
+
+    # access keys are picked up from environment variables
+    if endpoint_url:
+        config = boto3.session.Config(s3={'addressing_style': 'path'}, max_pool_connections=get_s3_max_pool_connections())
+        return boto3.client("s3", endpoint_url=endpoint_url, config=config)
+    config = boto3.session.Config(max_pool_connections=get_s3_max_pool_connections())
+    return boto3.client("s3", config=config)
+
+
+def get_transfer_config() -> "TransferConfig":
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=get_s3_multipart_threshold(),
+        multipart_chunksize=get_s3_multipart_chunksize(),
+        max_concurrency=get_s3_max_concurrency(),
+        use_threads=True,
+    )
+
+
+class S3UploadService:
+    """Uploads files through a single s3transfer manager.
+
+    All uploads share the manager's worker threads, so a batch of small DLLs is sent
+    concurrently instead of paying one round trip after another, and large files are
+    split into multipart chunks that are uploaded in parallel on the same pool.
+    """
+
+    def __init__(self, s3_client, bucket_name: str, transfer_config: "TransferConfig", checksum_algorithm: Optional[str] = None):
+        from boto3.s3.transfer import create_transfer_manager
+
+        self.bucket_name = bucket_name
+        self.extra_args = {"ChecksumAlgorithm": checksum_algorithm} if checksum_algorithm else {}
+        self.transfer_manager = create_transfer_manager(s3_client, transfer_config)
+
+    def upload_files(self, files: List[Tuple[Path, str]]) -> int:
+        """Upload (local path, key) pairs concurrently and return the number of bytes sent.
+
+        Every upload in the batch is awaited; the first error is raised afterwards.
+        """
+        futures = [
+            self.transfer_manager.upload(str(path), self.bucket_name, key, extra_args=self.extra_args)
+            for path, key in files
+        ]
+        error = None
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                error = error or e
+        if error:
+            raise error
+        return sum(path.stat().st_size for path, _ in files)
+
+    def close(self):
+        self.transfer_manager.shutdown()
+
+
+_upload_services: Dict[Tuple[str, Optional[str]], S3UploadService] = {}
+_upload_services_lock = threading.Lock()
+
+
+def get_upload_service(bucket_name: str, endpoint_url: Optional[str] = None) -> S3UploadService:
+    # one transfer manager for the whole process: concurrent source syncs share its worker
+    # threads, so the client's pool only has to cover S3_MAX_CONCURRENCY connections
+    with _upload_services_lock:
+        service = _upload_services.get((bucket_name, endpoint_url))
+        if service is None:
+            service = S3UploadService(get_s3_client(endpoint_url), bucket_name, get_transfer_config(), get_s3_checksum_algorithm())
+            _upload_services[(bucket_name, endpoint_url)] = service
+        return service
+
+
+def close_upload_services():
+    """Shut down the shared transfer managers, waiting for uploads in flight."""
+    with _upload_services_lock:
+        services = list(_upload_services.values())
+        _upload_services.clear()
+    for service in services:
+        service.close()
 
 
 class DXMTArtifactManager:
@@ -14,19 +111,27 @@ class DXMTArtifactManager:
         self.bucket_name = bucket_name
         self.bucket_prefix = bucket_prefix
         self.bucket_url = f"s3://{bucket_name}/{bucket_prefix}"
-        # access keys are picked up from environment variables
-        if endpoint_url:
-            self.s3_client = boto3.client("s3", endpoint_url=endpoint_url, config=boto3.session.Config(s3={'addressing_style': 'path'}))
-        else:
-            self.s3_client = boto3.client("s3")
+        self.endpoint_url = endpoint_url
+        self.s3_client = get_s3_client(endpoint_url)
+
+    @property
+    def upload_service(self) -> S3UploadService:
+        # created on first use, the API only ever generates presigned URLs
+        return get_upload_service(self.bucket_name, self.endpoint_url)
+
 
+    def _get_source_prefix(self, source: str) -> str:
+        # the original source keeps the layout from before sources existed, so its objects stay valid.
+        # Other sources get their own subtree, so no name can collide with its builtin/, release/, wow64/ or manifests/
+        return self.bucket_prefix + ("" if source == DEFAULT_SOURCE else f"sources/{source}/")
 
     def _get_s3_key(self, artifact: Union[BuiltinArtifact, ReleaseArtifact]) -> str:
-        prefix = "wow64/" if artifact.is_wow64 else ""
+        prefix = self._get_source_prefix(artifact.source)
+        prefix += "wow64/" if artifact.is_wow64 else ""
         if isinstance(artifact, BuiltinArtifact):
-            return f"{self.bucket_prefix}{prefix}builtin/{artifact.build_id}/{artifact.name}"
+            return f"{prefix}builtin/{artifact.build_id}/{artifact.name}"
         elif isinstance(artifact, ReleaseArtifact):
-            return f"{self.bucket_prefix}{prefix}release/{artifact.build_tag}/{artifact.name}"
+            return f"{prefix}release/{artifact.build_tag}/{artifact.name}"
         raise ValueError(f"Unknown artifact type: {type(artifact)}")
 
     def get_presigned_url(self, artifact: Union[BuiltinArtifact, ReleaseArtifact], expiration: int = 3600) -> str:
@@ -41,21 +146,32 @@ class DXMTArtifactManager:
             ExpiresIn=expiration,
         )
 
+    def delete_objects(self, keys: List[str]) -> List[str]:
+        # returns the keys that could not be deleted; DeleteObjects takes at most 1000 keys per request
+        failed = []
+        for start in range(0, len(keys), 1000):
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True},
+            )
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
 
-    def list_builds(self, page: int = 1, page_size: int = 10) -> List[Union[BuiltinBuild, ReleaseBuild]]:
+    def list_builds(self, page: int = 1, page_size: int = 10, source: str = DEFAULT_SOURCE) -> List[Union[BuiltinBuild, ReleaseBuild]]:
         offset = (page - 1) * page_size
 
         q_builtin = select(
             literal("builtin").label("type"),
             cast(col(BuiltinBuild.github_run_id), String).label("id"),
             col(BuiltinBuild.created_at),
-        )
+        ).where(BuiltinBuild.source == source)
 
         q_release = select(
             literal("release").label("type"),
             col(ReleaseBuild.tag).label("id"),
             col(ReleaseBuild.created_at),
-        )
+        ).where(ReleaseBuild.source == source)
 
         combined_query = (
             union_all(q_builtin, q_release)
@@ -82,7 +198,7 @@ class DXMTArtifactManager:
             builds.extend(
                 self.db_session.exec(
                     select(ReleaseBuild)
-                    .where(col(ReleaseBuild.tag).in_(release_ids))
+                    .where(ReleaseBuild.source == source, col(ReleaseBuild.tag).in_(release_ids))
                     .options(selectinload(ReleaseBuild.artifacts))
                 ).all()
             )
@@ -97,22 +213,27 @@ class DXMTArtifactManager:
         id: Optional[int] = None,
         commit_sha: Optional[str] = None,
         wow64: bool = False,
+        source: str = DEFAULT_SOURCE,
     ) -> List[Union[BuiltinArtifact, ReleaseArtifact]]:
         if tag:
             # List artifacts for a release build by tag
             return list(self.db_session.exec(
-                select(ReleaseArtifact).where(ReleaseArtifact.build_tag == tag, ReleaseArtifact.is_wow64 == wow64)
+                select(ReleaseArtifact).where(
+                    ReleaseArtifact.source == source, ReleaseArtifact.build_tag == tag, ReleaseArtifact.is_wow64 == wow64
+                )
             ).all())
         elif id:
             # List artifacts for a builtin build by github_run_id
             return list(self.db_session.exec(
-                select(BuiltinArtifact).where(BuiltinArtifact.build_id == id, BuiltinArtifact.is_wow64 == wow64)
+                select(BuiltinArtifact).where(
+                    BuiltinArtifact.source == source, BuiltinArtifact.build_id == id, BuiltinArtifact.is_wow64 == wow64
+                )
             ).all())
         elif commit_sha:
             # List artifacts for a builtin build by commit_sha
             # First find the build_id from the commit_sha
             build = self.db_session.exec(
-                select(BuiltinBuild).where(BuiltinBuild.commit_sha == commit_sha)
+                select(BuiltinBuild).where(BuiltinBuild.source == source, BuiltinBuild.commit_sha == commit_sha)
             ).first()
             if build:
                 return list(self.db_session.exec(
@@ -1,15 +1,93 @@
+import logging
 import os
+import threading
+import time
 from typing import Optional
 
 import requests
 from pathlib import Path
 
 from .models.github import (
+    GitHubActionRun,
     GitHubActionRunsResponse,
     GitHubActionArtifactsResponse,
     GitHubRelease,
 )
 
+logger = logging.getLogger(__name__)
+
+
+class RateBudget:
+    """GitHub's primary rate limit, shared by every thread that uses the same client.
+
+    The remaining budget is taken from the ``X-RateLimit-*`` headers of each response.
+    Requests are paced by a token bucket that refills at the rate which spends the
+    budget above ``reserve`` exactly by the time the window resets, and holds up to
+    ``burst`` tokens so short bursts go out at full speed. Once the budget drops to
+    ``reserve`` requests, callers wait for the window to reset instead of running into 403s.
+    """
+
+    def __init__(self, reserve: int = 50, burst: int = 100):
+        self.reserve = reserve
+        self.burst = burst
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self._limit: Optional[int] = None
+        self._tokens = float(burst)
+        self._refilled_at = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                if self.remaining is None or now >= self.reset_at:
+                    # no window known yet, or it has reset: nothing to pace against
+                    self._tokens = float(self.burst)
+                    self._refilled_at = now
+                    return
+
+                usable = self.remaining - self.reserve
+                if usable > 0:
+                    rate = usable / max(self.reset_at - now, 1.0)
+                    self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * rate)
+                    self._refilled_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.remaining -= 1
+                        return
+                    wait = (1 - self._tokens) / rate
+                    exhausted = False
+                else:
+                    wait = self.reset_at - now
+                    exhausted = True
+            if exhausted:
+                logger.warning(f"GitHub rate budget exhausted, waiting {wait:.0f}s for reset")
+            time.sleep(wait)
+
+    def usable_fraction(self) -> float:
+        # share of the current window's budget above the reserve that is still left, 1.0 if unknown
+        with self._lock:
+            if self.remaining is None or time.time() >= self.reset_at or self._limit is None:
+                return 1.0
+            return max(0.0, (self.remaining - self.reserve) / max(self._limit - self.reserve, 1))
+
+    def update(self, response: requests.Response):
+        limit = response.headers.get("X-RateLimit-Limit")
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        retry_after = response.headers.get("Retry-After")
+        with self._lock:
+            if limit is not None:
+                self._limit = int(limit)
+            if remaining is not None and reset is not None:
+                self.remaining = int(remaining)
+                self.reset_at = float(reset)
+            if retry_after is not None:
+                # secondary rate limits only say how long to back off
+                self.remaining = 0
+                self.reset_at = max(self.reset_at, time.time() + float(retry_after))
+
 
 class GitHubAPIClient:
     BASE_URL = "https://api.github.com"
@@ -18,9 +96,17 @@ class GitHubAPIClient:
         "X-GitHub-Api-Version": "2022-11-28",
     }
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, base_url: Optional[str] = None, rate_budget: Optional[RateBudget] = None):
         if token is None:
             token = os.getenv("GITHUB_TOKEN")
+        if base_url is None:
+            base_url = os.getenv("GITHUB_API_URL", self.BASE_URL)
+
+        self.base_url = base_url.rstrip("/")
+        self.rate_budget = rate_budget or RateBudget(
+            reserve=int(os.getenv("GITHUB_RATE_RESERVE", "50")),
+            burst=int(os.getenv("GITHUB_RATE_BURST", "100")),
+        )
 
         self.headers = self.HEADERS.copy()
         if token == "":
@@ -28,35 +114,50 @@ class GitHubAPIClient:
         self.headers["Authorization"] = f"Bearer {token}"
 
 
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        self.rate_budget.acquire()
+        response = requests.get(url, **kwargs)
+        self.rate_budget.update(response)
+        return response
+
+
     def get_action_runs(self, owner: str, repo: str, per_page: int = 30, page: int = 1, status: Optional[str] = None):
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/actions/runs"
+        url = f"{self.base_url}/repos/{owner}/{repo}/actions/runs"
         params = {
             "per_page": per_page,
             "page": page
         }
         if status:
             params["status"] = status
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, headers=self.headers, params=params)
         response.raise_for_status()
 
         return GitHubActionRunsResponse.model_validate_json(response.text)
 
 
+    def get_action_run(self, owner: str, repo: str, run_id: int) -> GitHubActionRun:
+        url = f"{self.base_url}/repos/{owner}/{repo}/actions/runs/{run_id}"
+        response = self._get(url, headers=self.headers)
+        response.raise_for_status()
+
+        return GitHubActionRun.model_validate_json(response.text)
+
+
     def get_run_artifacts(self, owner: str, repo: str, run_id: int, per_page: int = 30, page: int = 1):
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/actions/runs/{run_id}/artifacts"
+        url = f"{self.base_url}/repos/{owner}/{repo}/actions/runs/{run_id}/artifacts"
         params = {
             "per_page": per_page,
             "page": page
         }
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, headers=self.headers, params=params)
         response.raise_for_status()
 
         return GitHubActionArtifactsResponse.model_validate_json(response.text)
 
 
     def download_artifact(self, dest_path: Path, owner: str, repo: str, artifact_id: int):
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/actions/artifacts/{artifact_id}/zip"
-        response = requests.get(url, headers=self.headers, stream=True)
+        url = f"{self.base_url}/repos/{owner}/{repo}/actions/artifacts/{artifact_id}/zip"
+        response = self._get(url, headers=self.headers, stream=True)
         response.raise_for_status()
 
         with open(dest_path, "wb") as f:
@@ -67,24 +168,32 @@ class GitHubAPIClient:
 
 
     def get_releases(self, owner: str, repo: str, per_page: int = 30, page: int = 1) -> list[GitHubRelease]:
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases"
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases"
         params = {
             "per_page": per_page,
             "page": page
         }
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._get(url, headers=self.headers, params=params)
         response.raise_for_status()
 
         return [GitHubRelease.model_validate(r) for r in response.json()]
 
 
+    def get_release_by_tag(self, owner: str, repo: str, tag: str) -> GitHubRelease:
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases/tags/{tag}"
+        response = self._get(url, headers=self.headers)
+        response.raise_for_status()
+
+        return GitHubRelease.model_validate_json(response.text)
+
+
     def download_release_asset(self, dest_path: Path, owner: str, repo: str, asset_id: int):
         # For release assets, we need to use a different Accept header to download the binary
         headers = self.headers.copy()
         headers["Accept"] = "application/octet-stream"
 
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/releases/assets/{asset_id}"
-        response = requests.get(url, headers=headers, stream=True)
+        url = f"{self.base_url}/repos/{owner}/{repo}/releases/assets/{asset_id}"
+        response = self._get(url, headers=headers, stream=True)
         response.raise_for_status()
 
         with open(dest_path, "wb") as f:
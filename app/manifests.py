@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Union
+
+from sqlmodel import Session, select, col
+
+from .artifact_manager import DXMTArtifactManager
+from .models.builds import BuiltinBuild, ReleaseBuild, BuiltinArtifact, ReleaseArtifact
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# index snapshots never change once written; the index and the latest pointers are
+# overwritten by every sync that adds a build. Build manifests are rewritten when the
+# integrity verifier repairs a file or learns its size, so caches revalidate them.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+BUILD_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+MUTABLE_CACHE_CONTROL = "public, max-age=60"
+
+# immutable index snapshots kept per source, older ones are deleted
+INDEX_SNAPSHOT_RETENTION = 50
+
+CHANNELS = {
+    # channel: (build type, wow64)
+    "builtin": ("builtin", False),
+    "builtin-wow64": ("builtin", True),
+    "release": ("release", False),
+    "release-wow64": ("release", True),
+}
+
+
+class ManifestPublisher:
+    """Publishes the catalog of one source as static, gzip-encoded JSON in the bucket.
+
+    Layout, below the source's prefix::
+
+        manifests/v1/index.json                   every build, newest first
+        manifests/v1/index/{generation}.json      immutable snapshot of the index
+        manifests/v1/builds/builtin/{run_id}.json files of one CI build
+        manifests/v1/builds/release/{tag}.json    files of one release
+        manifests/v1/latest/{channel}.json        newest build of builtin, builtin-wow64, release, release-wow64
+
+    Each object is written with a single PUT, so readers never see a partial file.
+    Build manifests are written before the index and the index before the latest
+    pointers, so everything a pointer references already exists.
+    """
+
+    def __init__(self, session: Session, artifact_manager: DXMTArtifactManager, source: str):
+        self.session = session
+        self.artifact_manager = artifact_manager
+        self.source = source
+        self.prefix = f"{artifact_manager._get_source_prefix(source)}manifests/v{MANIFEST_VERSION}/"
+
+    def _put(self, key: str, payload: dict, cache_control: str, metadata: Optional[dict] = None):
+        body = gzip.compress(json.dumps(payload, separators=(",", ":"), default=str).encode(), mtime=0)
+        self.artifact_manager.s3_client.put_object(
+            Bucket=self.artifact_manager.bucket_name,
+            Key=key,
+            Body=body,
+            ContentType="application/json",
+            ContentEncoding="gzip",
+            CacheControl=cache_control,
+            Metadata=metadata or {},
+        )
+
+    def _published_index_digest(self) -> Optional[str]:
+        try:
+            response = self.artifact_manager.s3_client.head_object(
+                Bucket=self.artifact_manager.bucket_name, Key=f"{self.prefix}index.json"
+            )
+        except self.artifact_manager.s3_client.exceptions.ClientError:
+            return None
+        return response.get("Metadata", {}).get("content-sha256")
+
+    def _prune_index_snapshots(self):
+        # generations are millisecond timestamps of equal length, so key order is age order
+        snapshots = sorted(self._existing_keys(f"{self.prefix}index/"))
+        stale = snapshots[:-INDEX_SNAPSHOT_RETENTION]
+        if stale:
+            self.artifact_manager.delete_objects(stale)
+
+    def _build_key(self, build: Union[BuiltinBuild, ReleaseBuild]) -> str:
+        if isinstance(build, BuiltinBuild):
+            return f"{self.prefix}builds/builtin/{build.github_run_id}.json"
+        return f"{self.prefix}builds/release/{build.tag}.json"
+
+    def _build_summary(self, build: Union[BuiltinBuild, ReleaseBuild]) -> dict:
+        summary = {
+            "created_at": build.created_at.isoformat(),
+            "artifact_count": build.artifact_count,
+            "has_wow64": build.has_wow64,
+            "manifest": self._build_key(build),
+        }
+        if isinstance(build, BuiltinBuild):
+            summary.update(
+                type="builtin",
+                id=str(build.github_run_id),
+                github_run_id=build.github_run_id,
+                commit_sha=build.commit_sha,
+                description=build.description,
+            )
+        else:
+            summary.update(type="release", id=build.tag, tag=build.tag)
+        return summary
+
+    def _file_entries(self, artifacts: List[Union[BuiltinArtifact, ReleaseArtifact]]) -> List[dict]:
+        return [
+            {
+                "name": artifact.name,
+                "is_wow64": artifact.is_wow64,
+                "size": artifact.size,
+                "sha256": artifact.sha256,
+                "key": self.artifact_manager._get_s3_key(artifact),
+            }
+            for artifact in sorted(artifacts, key=lambda a: (a.is_wow64, a.name))
+        ]
+
+    def publish_build(self, build: Union[BuiltinBuild, ReleaseBuild]):
+        self._put(self._build_key(build), {
+            "version": MANIFEST_VERSION,
+            "source": self.source,
+            "build": self._build_summary(build),
+            "files": self._file_entries(build.artifacts),
+        }, BUILD_CACHE_CONTROL)
+
+    def _existing_keys(self, prefix: str) -> set:
+        keys = set()
+        paginator = self.artifact_manager.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.artifact_manager.bucket_name, Prefix=prefix):
+            keys.update(obj["Key"] for obj in page.get("Contents", []))
+        return keys
+
+    def publish_catalog(self):
+        """Rewrite the index and the latest pointer of every channel.
+
+        Build manifests that are missing from the bucket (builds mirrored before
+        manifests existed, or a failed publish) are written first.
+        """
+        builtin_builds = self.session.exec(
+            select(BuiltinBuild)
+            .where(BuiltinBuild.source == self.source)
+            .order_by(col(BuiltinBuild.created_at).desc())
+        ).all()
+        release_builds = self.session.exec(
+            select(ReleaseBuild)
+            .where(ReleaseBuild.source == self.source)
+            .order_by(col(ReleaseBuild.created_at).desc())
+        ).all()
+
+        existing = self._existing_keys(f"{self.prefix}builds/")
+        missing = [b for b in [*builtin_builds, *release_builds] if self._build_key(b) not in existing]
+        for build in missing:
+            self.publish_build(build)
+
+        builds = sorted([*builtin_builds, *release_builds], key=lambda b: b.created_at, reverse=True)
+        summaries = [self._build_summary(build) for build in builds]
+        # the index and the latest pointers are derived from the same builds; nothing to write if they did not change
+        digest = hashlib.sha256(json.dumps(summaries, separators=(",", ":"), default=str).encode()).hexdigest()
+        if digest == self._published_index_digest():
+            logger.info(f"Catalog manifests for {self.source} are up to date ({len(missing)} new build manifests)")
+            return
+
+        generation = time.time_ns() // 1_000_000
+        generated_at = datetime.now(timezone.utc).isoformat()
+        index = {
+            "version": MANIFEST_VERSION,
+            "source": self.source,
+            "generation": generation,
+            "generated_at": generated_at,
+            "builds": summaries,
+        }
+        self._put(f"{self.prefix}index/{generation}.json", index, IMMUTABLE_CACHE_CONTROL)
+        self._put(f"{self.prefix}index.json", index, MUTABLE_CACHE_CONTROL, {"content-sha256": digest})
+
+        for channel, (build_type, wow64) in CHANNELS.items():
+            candidates = builtin_builds if build_type == "builtin" else release_builds
+            build = next((b for b in candidates if b.artifact_count and (b.has_wow64 or not wow64)), None)
+            if build is None:
+                continue
+            self._put(f"{self.prefix}latest/{channel}.json", {
+                "version": MANIFEST_VERSION,
+                "source": self.source,
+                "channel": channel,
+                "generation": generation,
+                "generated_at": generated_at,
+                "build": self._build_summary(build),
+                "files": self._file_entries([a for a in build.artifacts if a.is_wow64 == wow64]),
+            }, MUTABLE_CACHE_CONTROL)
+
+        self._prune_index_snapshots()
+        logger.info(f"Published catalog manifests for {self.source}: {len(builds)} builds "
+                    f"({len(missing)} new manifests), generation {generation}")
@@ -0,0 +1,259 @@
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Float, ForeignKeyConstraint, Integer, MetaData, String, Table, UniqueConstraint,
+    inspect, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import SQLModel
+
+from .models import builds, sync  # noqa: F401 - registers the tables on SQLModel.metadata
+from .models.sources import DEFAULT_SOURCE
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schemaversion"
+# arbitrary, it only has to differ from other advisory locks taken on the same database
+MIGRATION_LOCK_KEY = 0x64786D74
+
+
+def _tables(conn: Connection) -> set:
+    return set(inspect(conn).get_table_names())
+
+
+def _columns(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+# Migrations describe the tables as they were at that version instead of using the
+# SQLModel classes, which always reflect the latest schema.
+
+def _add_source_namespace(conn: Connection):
+    tables = _tables(conn)
+    for table in ("builtinbuild", "builtinartifact", "syncrun"):
+        if table in tables and "source" not in _columns(conn, table):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN source VARCHAR NOT NULL DEFAULT '{DEFAULT_SOURCE}'"))
+    if "builtinbuild" in tables:
+        conn.execute(text("CREATE INDEX ix_builtinbuild_source ON builtinbuild (source)"))
+    if "syncrun" in tables:
+        conn.execute(text("CREATE INDEX ix_syncrun_source ON syncrun (source)"))
+
+    if "releasebuild" not in tables:
+        return
+
+    # release tags are only unique within a source, so the source joins the primary key.
+    # Changing a primary key means rebuilding the release tables; there are few enough
+    # releases to hold them in memory, which avoids renaming tables, indexes and constraints.
+    release_builds = conn.execute(
+        text("SELECT tag, created_at, artifact_count, has_wow64 FROM releasebuild")
+        .columns(created_at=DateTime, has_wow64=Boolean)
+    ).mappings().all()
+    release_artifacts = conn.execute(
+        text("SELECT id, build_tag, name, is_wow64 FROM releaseartifact").columns(is_wow64=Boolean)
+    ).mappings().all()
+    conn.execute(text("DROP TABLE releaseartifact"))
+    conn.execute(text("DROP TABLE releasebuild"))
+
+    metadata = MetaData()
+    release_build_table = Table(
+        "releasebuild", metadata,
+        Column("source", String, primary_key=True),
+        Column("tag", String, primary_key=True, index=True),
+        Column("created_at", DateTime, nullable=False, index=True),
+        Column("artifact_count", Integer, nullable=False),
+        Column("has_wow64", Boolean, nullable=False),
+    )
+    release_artifact_table = Table(
+        "releaseartifact", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("source", String, nullable=False),
+        Column("build_tag", String, nullable=False, index=True),
+        Column("name", String, nullable=False),
+        Column("is_wow64", Boolean, nullable=False),
+        ForeignKeyConstraint(["source", "build_tag"], ["releasebuild.source", "releasebuild.tag"]),
+    )
+    metadata.create_all(conn)
+
+    if release_builds:
+        conn.execute(release_build_table.insert(), [{**row, "source": DEFAULT_SOURCE} for row in release_builds])
+    if release_artifacts:
+        conn.execute(release_artifact_table.insert(), [{**row, "source": DEFAULT_SOURCE} for row in release_artifacts])
+        if conn.dialect.name == "postgresql":
+            # the rows kept their ids, move the new table's sequence past them
+            conn.execute(text(
+                "SELECT setval(pg_get_serial_sequence('releaseartifact', 'id'), (SELECT MAX(id) FROM releaseartifact))"
+            ))
+
+
+def _add_artifact_size_and_hash(conn: Connection):
+    tables = _tables(conn)
+    for table in ("builtinartifact", "releaseartifact"):
+        if table not in tables:
+            continue
+        columns = _columns(conn, table)
+        if "size" not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN size INTEGER"))
+        if "sha256" not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN sha256 VARCHAR"))
+
+
+def _create_sync_runs(conn: Connection):
+    # syncrun was added before migrations existed and only created by create_all,
+    # which no longer runs on existing databases
+    if "syncrun" in _tables(conn):
+        return
+    metadata = MetaData()
+    Table(
+        "syncrun", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("source", String, nullable=False, index=True),
+        Column("started_at", DateTime, nullable=False, index=True),
+        Column("duration", Float, nullable=False),
+        Column("status", String, nullable=False),
+        Column("error", String),
+        Column("builds_synced", Integer, nullable=False),
+        Column("bytes_uploaded", Integer, nullable=False),
+        Column("files_uploaded", Integer, nullable=False),
+        Column("stages", JSON),
+        Column("items", JSON),
+        Column("profile_path", String),
+    )
+    metadata.create_all(conn)
+
+
+def _create_staged_artifacts(conn: Connection):
+    if "stagedartifact" in _tables(conn):
+        return
+    metadata = MetaData()
+    Table(
+        "stagedartifact", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("source", String, nullable=False),
+        Column("run_id", Integer, nullable=False, index=True),
+        Column("artifact_id", Integer, nullable=False, index=True),
+        Column("name", String, nullable=False),
+        Column("is_wow64", Boolean, nullable=False),
+        Column("size", Integer),
+        Column("sha256", String),
+        Column("staged_at", DateTime, nullable=False),
+    )
+    metadata.create_all(conn)
+
+
+def _create_integrity_sweeps(conn: Connection):
+    if "integritysweep" in _tables(conn):
+        return
+    metadata = MetaData()
+    Table(
+        "integritysweep", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("source", String, nullable=False, index=True),
+        Column("started_at", DateTime, nullable=False, index=True),
+        Column("finished_at", DateTime),
+        Column("cursor", String),
+        Column("objects_checked", Integer, nullable=False),
+        Column("missing", Integer, nullable=False),
+        Column("orphaned", Integer, nullable=False),
+        Column("size_mismatched", Integer, nullable=False),
+        Column("repaired", Integer, nullable=False),
+        Column("issues", JSON),
+    )
+    metadata.create_all(conn)
+
+
+def _create_sync_jobs(conn: Connection):
+    if "syncjob" in _tables(conn):
+        return
+    metadata = MetaData()
+    Table(
+        "syncjob", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("source", String, nullable=False, index=True),
+        Column("kind", String, nullable=False),
+        Column("target", String, nullable=False),
+        Column("priority", Integer, nullable=False, index=True),
+        Column("upstream_created_at", DateTime, nullable=False),
+        Column("status", String, nullable=False, index=True),
+        Column("attempts", Integer, nullable=False),
+        Column("next_attempt_at", DateTime, nullable=False),
+        Column("last_error", String),
+        Column("payload", JSON),
+        UniqueConstraint("source", "kind", "target"),
+    )
+    metadata.create_all(conn)
+
+
+# (version, description, upgrade). Append only; never edit a migration that has shipped.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add source namespace", _add_source_namespace),
+    (2, "add artifact size and hash", _add_artifact_size_and_hash),
+    (3, "create sync runs", _create_sync_runs),
+    (4, "create staged artifacts", _create_staged_artifacts),
+    (5, "create integrity sweeps", _create_integrity_sweeps),
+    (6, "create sync jobs", _create_sync_jobs),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _current_version(conn: Connection) -> Optional[int]:
+    try:
+        return conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")).scalar_one()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+@contextmanager
+def _locked(engine: Engine) -> Iterator[Connection]:
+    # a transaction only one process holds at a time, so replicas starting together migrate once
+    with engine.begin() as conn:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        elif dialect == "mysql":
+            conn.execute(text("SELECT GET_LOCK(:name, -1)"), {"name": SCHEMA_VERSION_TABLE})
+        elif dialect == "sqlite":
+            # takes the write lock now; pysqlite would only begin a transaction at the first INSERT
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        finally:
+            if dialect == "mysql":
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": SCHEMA_VERSION_TABLE})
+
+
+def migrate(engine: Engine):
+    """Bring the database schema up to date.
+
+    An up-to-date database costs a single query, there is no reflection or
+    create_all on a normal boot. A fresh database gets the current schema directly.
+    A database created before versioning existed (tables but no version table) is
+    treated as version 0. Migrating holds a database-wide lock; a process that had
+    to wait for it finds the schema up to date and does nothing.
+    """
+    with engine.connect() as conn:
+        if _current_version(conn) == LATEST_VERSION:
+            return
+
+    with _locked(engine) as conn:
+        tables = _tables(conn)
+        if SCHEMA_VERSION_TABLE not in tables:
+            if "builtinbuild" in tables:
+                version = 0
+            else:
+                SQLModel.metadata.create_all(conn)
+                version = LATEST_VERSION
+            conn.execute(text(f"CREATE TABLE {SCHEMA_VERSION_TABLE} (version INTEGER NOT NULL)"))
+            conn.execute(text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version) VALUES (:version)"), {"version": version})
+        else:
+            version = conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")).scalar_one()
+
+        for target, description, upgrade in MIGRATIONS:
+            if target <= version:
+                continue
+            logger.info(f"Migrating database schema to version {target}: {description}")
+            upgrade(conn)
+            conn.execute(text(f"UPDATE {SCHEMA_VERSION_TABLE} SET version = :version"), {"version": target})
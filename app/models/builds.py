@@ -1,14 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 
+from sqlalchemy import ForeignKeyConstraint
 from sqlmodel import Field, Relationship, SQLModel
 from pydantic import field_validator
 
+from .sources import DEFAULT_SOURCE
+
 
 class BuiltinBuild(SQLModel, table=True):
     __tablename__ = "builtinbuild"
 
-    github_run_id: int = Field(primary_key=True)  # the github action run ID
+    github_run_id: int = Field(primary_key=True)  # the github action run ID, unique across repositories
+    source: str = Field(default=DEFAULT_SOURCE, index=True)  # UpstreamSource.name
     commit_sha: str = Field(index=True)
     description: str
     created_at: datetime = Field(index=True)
@@ -20,7 +24,8 @@ class BuiltinBuild(SQLModel, table=True):
 
 class ReleaseBuild(SQLModel, table=True):
     __tablename__ = "releasebuild"
-    tag: str = Field(primary_key=True, index=True)  # the release tag
+    source: str = Field(default=DEFAULT_SOURCE, primary_key=True)  # UpstreamSource.name
+    tag: str = Field(primary_key=True, index=True)  # the release tag, only unique within a source
     created_at: datetime = Field(index=True)
     artifact_count: int
     has_wow64: bool = Field(default=False)
@@ -36,8 +41,11 @@ class BuiltinArtifact(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     artifact_id: int = Field(index=True)  # corresponds to GitHub artifact ID can be non-unique
     build_id: int = Field(foreign_key="builtinbuild.github_run_id", index=True)
+    source: str = Field(default=DEFAULT_SOURCE)
     name: str  # file name without any path components
     is_wow64: bool = Field(default=False)
+    size: Optional[int] = None  # bytes, unknown for files mirrored before sizes were recorded
+    sha256: Optional[str] = None  # hex digest, unknown for files mirrored before hashes were recorded
 
     build: BuiltinBuild = Relationship(back_populates="artifacts")
 
@@ -52,10 +60,16 @@ class ReleaseArtifact(SQLModel, table=True):
     # This represents a file artifact produced by a built-in build.
     # one build can have multiple files (dll, so, etc)
     __tablename__ = "releaseartifact"
+    __table_args__ = (
+        ForeignKeyConstraint(["source", "build_tag"], ["releasebuild.source", "releasebuild.tag"]),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
-    build_tag: str = Field(foreign_key="releasebuild.tag", index=True)
+    source: str = Field(default=DEFAULT_SOURCE)
+    build_tag: str = Field(index=True)
     name: str  # file name without any path components
     is_wow64: bool = Field(default=False)
+    size: Optional[int] = None  # bytes, unknown for files mirrored before sizes were recorded
+    sha256: Optional[str] = None  # hex digest, unknown for files mirrored before hashes were recorded
 
     build: ReleaseBuild = Relationship(back_populates="artifacts")
 
@@ -64,3 +78,42 @@ class ReleaseArtifact(SQLModel, table=True):
         if "/" in v or "\\" in v:
             raise ValueError("Artifact name must not contain path components")
         return v
+
+
+class StagedArtifact(SQLModel, table=True):
+    # A file of a CI run that is still in progress. It is uploaded to the key it will have
+    # as a BuiltinArtifact but stays out of the catalog until the run concludes with success.
+    __tablename__ = "stagedartifact"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str = Field(default=DEFAULT_SOURCE)
+    run_id: int = Field(index=True)  # the github action run ID, no build row exists yet
+    artifact_id: int = Field(index=True)
+    name: str  # file name without any path components
+    is_wow64: bool = Field(default=False)
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    staged_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def from_builtin_artifact(cls, artifact: BuiltinArtifact) -> "StagedArtifact":
+        return cls(
+            source=artifact.source,
+            run_id=artifact.build_id,
+            artifact_id=artifact.artifact_id,
+            name=artifact.name,
+            is_wow64=artifact.is_wow64,
+            size=artifact.size,
+            sha256=artifact.sha256,
+        )
+
+    def to_builtin_artifact(self) -> BuiltinArtifact:
+        return BuiltinArtifact(
+            source=self.source,
+            artifact_id=self.artifact_id,
+            build_id=self.run_id,
+            name=self.name,
+            is_wow64=self.is_wow64,
+            size=self.size,
+            sha256=self.sha256,
+        )
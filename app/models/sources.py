@@ -0,0 +1,62 @@
+from fnmatch import fnmatch
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+# Namespace of the original upstream. Builds synced before sources were configurable belong to it.
+DEFAULT_SOURCE = "dxmt"
+
+
+def _matches(value: str, patterns: List[str]) -> bool:
+    value = value.lower()
+    return any(fnmatch(value, pattern.lower()) for pattern in patterns)
+
+
+class UpstreamSource(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str  # namespace used in the catalog, S3 keys and API paths
+    owner: str
+    repo: str
+
+    # workflow file paths (run.path) to mirror CI runs from
+    workflow_patterns: List[str] = ["*"]
+    exclude_workflow_patterns: List[str] = ["*native*"]
+    # artifact names to download from each run; wow64 artifacts are matched by name
+    artifact_patterns: List[str] = ["*release*"]
+    exclude_artifact_patterns: List[str] = ["*-gcc*"]
+    wow64_artifact_patterns: List[str] = ["*wow64*"]
+    file_suffixes: List[str] = [".dll", ".so"]
+    wow64_file_suffixes: List[str] = [".dll"]
+    # runs older than this are never mirrored
+    max_age_days: int = 100
+
+    # folders inside release tarballs to mirror
+    release_folders: List[str] = ["x86_64-windows", "x86_64-unix"]
+    release_wow64_folders: List[str] = ["i386-windows"]
+
+    sync_builds: bool = True
+    sync_releases: bool = True
+    # upload artifacts of in-progress runs as they appear, publish them once the run succeeds
+    prefetch_in_progress: bool = True
+
+    @field_validator("name")
+    def validate_name(cls, v):
+        if not v or "/" in v or "\\" in v:
+            raise ValueError("Source name must be non-empty and must not contain path components")
+        return v
+
+    def accepts_workflow(self, path: str) -> bool:
+        return _matches(path, self.workflow_patterns) and not _matches(path, self.exclude_workflow_patterns)
+
+    def accepts_artifact(self, name: str) -> bool:
+        return _matches(name, self.artifact_patterns) and not _matches(name, self.exclude_artifact_patterns)
+
+    def is_wow64_artifact(self, name: str) -> bool:
+        return _matches(name, self.wow64_artifact_patterns)
+
+    def accepts_file(self, suffix: str, is_wow64: bool) -> bool:
+        return suffix in (self.wow64_file_suffixes if is_wow64 else self.file_suffixes)
+
+
+DEFAULT_SOURCES = [UpstreamSource(name=DEFAULT_SOURCE, owner="3Shain", repo="dxmt")]
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, JSON, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from .sources import DEFAULT_SOURCE
+
+
+class SyncRun(SQLModel, table=True):
+    # One row per sync cycle, written by ArtifactSyncer when the cycle ends.
+    __tablename__ = "syncrun"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str = Field(default=DEFAULT_SOURCE, index=True)  # UpstreamSource.name
+    started_at: datetime = Field(index=True)
+    duration: float  # seconds
+    status: str  # "success" or "failed"
+    error: Optional[str] = None
+    builds_synced: int = Field(default=0)
+    bytes_uploaded: int = Field(default=0)
+    files_uploaded: int = Field(default=0)
+    # per stage aggregates, e.g. {"s3.upload": {"count": 12, "seconds": 1.3, "bytes": 1024, ...}}
+    stages: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    # per processed run id / release tag: {"kind", "id", "seconds", "bytes", "files", "stages"}
+    items: list = Field(default_factory=list, sa_column=Column(JSON))
+    profile_path: Optional[str] = None  # folded stacks, only for slow cycles with profiling enabled
+
+
+class IntegritySweep(SQLModel, table=True):
+    # One pass of the integrity verifier over a source's objects in the bucket. A sweep
+    # advances a batch per sync cycle and is finished once the last object was checked.
+    __tablename__ = "integritysweep"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str = Field(default=DEFAULT_SOURCE, index=True)  # UpstreamSource.name
+    started_at: datetime = Field(index=True)
+    finished_at: Optional[datetime] = None
+    cursor: Optional[str] = None  # last key checked, the next batch lists after it
+    objects_checked: int = Field(default=0)
+    missing: int = Field(default=0)  # catalog files without an object
+    orphaned: int = Field(default=0)  # objects without a catalog file
+    size_mismatched: int = Field(default=0)
+    repaired: int = Field(default=0)  # missing or mismatched files uploaded again from GitHub
+    # the first problems found: {"key", "problem", "expected_size", "actual_size", "repaired"}
+    issues: list = Field(default_factory=list, sa_column=Column(JSON))
+
+
+class SyncJob(SQLModel, table=True):
+    # A CI run or release waiting to be mirrored. Jobs are discovered by listing GitHub
+    # and dispatched by priority, each with its own retries, so one failing download
+    # no longer holds up the rest of the sync.
+    __tablename__ = "syncjob"
+    __table_args__ = (UniqueConstraint("source", "kind", "target"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str = Field(default=DEFAULT_SOURCE, index=True)  # UpstreamSource.name
+    kind: str  # "builtin" or "release"
+    target: str  # the run id or release tag
+    priority: int = Field(index=True)  # lower runs first, see syncer.PRIORITY_*
+    upstream_created_at: datetime  # newest first within a priority
+    status: str = Field(default="pending", index=True)  # "pending", "done" or "failed" (still retried)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime
+    last_error: Optional[str] = None
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))  # the GitHub run / release as listed
@@ -1,31 +1,67 @@
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Optional
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.routing import APIRouter
-from fastapi.responses import RedirectResponse
-from sqlmodel import Session
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+from sqlmodel import Session, select, col
 
-from .utils import get_db, get_bucket_name, get_endpoint_url
+from .utils import get_db, get_bucket_name, get_endpoint_url, get_source, get_sources
 from .artifact_manager import DXMTArtifactManager
+from .models.sources import DEFAULT_SOURCE
+from .models.sync import IntegritySweep, SyncJob, SyncRun
 
 router = APIRouter()
 artifact_router = APIRouter(prefix="/artifacts")
 build_router = APIRouter(prefix="/builds")
+admin_router = APIRouter(prefix="/admin")
+# the same routes namespaced by source; the unprefixed routes serve the default source
+source_router = APIRouter(prefix="/sources")
+source_artifact_router = APIRouter(prefix="/sources/{source}/artifacts")
+source_build_router = APIRouter(prefix="/sources/{source}/builds")
 
 def get_artifact_manager(session: Session = Depends(get_db)):
     return DXMTArtifactManager(session, bucket_name=get_bucket_name(), endpoint_url=get_endpoint_url())
 
+def get_source_name(source: str = DEFAULT_SOURCE) -> str:
+    if get_source(source) is None:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return source
+
 @router.get("/health")
+@router.get("/health/live")
 async def health_check():
+    # liveness: the process is up and serving, even while still warming up
     return {"status": "ok"}
 
 
+@router.get("/health/ready")
+async def readiness_check(request: Request):
+    state = getattr(request.app.state, "startup", None)
+    if state is None or state.ready:
+        return {"status": "ready", "timings": state.timings if state else {}}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "failed" if state.error else "starting", "error": state.error},
+    )
+
+
+@source_router.get("")
+async def list_sources():
+    return {"sources": [
+        {"name": source.name, "owner": source.owner, "repo": source.repo} for source in get_sources()
+    ]}
+
+
 @artifact_router.get("/list")
+@source_artifact_router.get("/list")
 async def list_artifacts(
     tag: Optional[str] = None,
     id: Optional[int] = None,
     commit_sha: Optional[str] = None,
     wow64: bool = False,
+    source: str = Depends(get_source_name),
     manager: DXMTArtifactManager = Depends(get_artifact_manager)
 ):
     if not tag and not id and not commit_sha:
@@ -35,29 +71,33 @@ async def list_artifacts(
     if id and commit_sha:
         return {"error": "id cannot be combined with commit_sha"}
 
-    artifacts = manager.list_artifacts(tag=tag, id=id, commit_sha=commit_sha, wow64=wow64)
+    artifacts = manager.list_artifacts(tag=tag, id=id, commit_sha=commit_sha, wow64=wow64, source=source)
     return {"artifacts": artifacts}
 
 
 @build_router.get("/list")
+@source_build_router.get("/list")
 async def list_builds(
     page: int = 1,
     page_size: int = 10,
+    source: str = Depends(get_source_name),
     manager: DXMTArtifactManager = Depends(get_artifact_manager)
 ):
-    builds = manager.list_builds(page=page, page_size=page_size)
+    builds = manager.list_builds(page=page, page_size=page_size, source=source)
     return {"builds": builds}
 
 
 @build_router.get("/download/{github_run_id}/artifact/{artifact_name}")
+@source_build_router.get("/download/{github_run_id}/artifact/{artifact_name}")
 async def download_build_artifact(
     github_run_id: int,
     artifact_name: str,
     wow64: bool = False,
+    source: str = Depends(get_source_name),
     manager: DXMTArtifactManager = Depends(get_artifact_manager)
 ):
     # Find the artifact
-    artifacts = manager.list_artifacts(id=github_run_id, wow64=wow64)
+    artifacts = manager.list_artifacts(id=github_run_id, wow64=wow64, source=source)
     target_artifact = next((a for a in artifacts if a.name == artifact_name), None)
 
     if not target_artifact:
@@ -67,14 +107,16 @@ async def download_build_artifact(
     return RedirectResponse(url=download_url)
 
 @artifact_router.get("/download/{tag}/artifact/{artifact_name}")
+@source_artifact_router.get("/download/{tag}/artifact/{artifact_name}")
 async def download_release_artifact(
     tag: str,
     artifact_name: str,
     wow64: bool = False,
+    source: str = Depends(get_source_name),
     manager: DXMTArtifactManager = Depends(get_artifact_manager)
 ):
     # Find the artifact
-    artifacts = manager.list_artifacts(tag=tag, wow64=wow64)
+    artifacts = manager.list_artifacts(tag=tag, wow64=wow64, source=source)
     target_artifact = next((a for a in artifacts if a.name == artifact_name), None)
 
     if not target_artifact:
@@ -82,3 +124,104 @@ async def download_release_artifact(
 
     download_url = manager.get_presigned_url(target_artifact)
     return RedirectResponse(url=download_url)
+
+
+@admin_router.get("/sync-runs")
+async def list_sync_runs(
+    page: int = 1,
+    page_size: int = 20,
+    source: Optional[str] = None,
+    session: Session = Depends(get_db)
+):
+    query = select(SyncRun)
+    if source:
+        query = query.where(SyncRun.source == source)
+    sync_runs = session.exec(
+        query
+        .order_by(col(SyncRun.id).desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    ).all()
+    # per item breakdowns can be large, they are only returned by the detail endpoint
+    return {"sync_runs": [run.model_dump(exclude={"items"}) for run in sync_runs]}
+
+
+@admin_router.get("/sync-runs/{sync_run_id}")
+async def get_sync_run(sync_run_id: int, session: Session = Depends(get_db)):
+    sync_run = session.get(SyncRun, sync_run_id)
+    if not sync_run:
+        raise HTTPException(status_code=404, detail="Sync run not found")
+    return sync_run
+
+
+@admin_router.get("/sync-runs/{sync_run_id}/profile")
+async def get_sync_run_profile(sync_run_id: int, session: Session = Depends(get_db)):
+    sync_run = session.get(SyncRun, sync_run_id)
+    if not sync_run or not sync_run.profile_path or not Path(sync_run.profile_path).is_file():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(sync_run.profile_path, media_type="text/plain")
+
+
+@admin_router.get("/sync-jobs")
+async def list_sync_jobs(
+    page: int = 1,
+    page_size: int = 50,
+    source: Optional[str] = None,
+    status: Optional[str] = "pending",
+    session: Session = Depends(get_db)
+):
+    query = select(SyncJob)
+    if source:
+        query = query.where(SyncJob.source == source)
+    if status:
+        query = query.where(SyncJob.status == status)
+    jobs = session.exec(
+        query
+        .order_by(col(SyncJob.priority), col(SyncJob.upstream_created_at).desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    ).all()
+    # the GitHub payloads are only needed by the syncer
+    return {"sync_jobs": [job.model_dump(exclude={"payload"}) for job in jobs]}
+
+
+@admin_router.post("/sync-jobs/{sync_job_id}/retry")
+async def retry_sync_job(sync_job_id: int, session: Session = Depends(get_db)):
+    # runs the job in the next sync cycle instead of waiting out its backoff
+    job = session.get(SyncJob, sync_job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    job.status = "pending"
+    job.attempts = 0
+    job.next_attempt_at = datetime.now(timezone.utc)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job.model_dump(exclude={"payload"})
+
+
+@admin_router.get("/integrity-sweeps")
+async def list_integrity_sweeps(
+    page: int = 1,
+    page_size: int = 20,
+    source: Optional[str] = None,
+    session: Session = Depends(get_db)
+):
+    query = select(IntegritySweep)
+    if source:
+        query = query.where(IntegritySweep.source == source)
+    sweeps = session.exec(
+        query
+        .order_by(col(IntegritySweep.id).desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    ).all()
+    return {"integrity_sweeps": [sweep.model_dump(exclude={"issues"}) for sweep in sweeps]}
+
+
+@admin_router.get("/integrity-sweeps/{sweep_id}")
+async def get_integrity_sweep(sweep_id: int, session: Session = Depends(get_db)):
+    sweep = session.get(IntegritySweep, sweep_id)
+    if not sweep:
+        raise HTTPException(status_code=404, detail="Integrity sweep not found")
+    return sweep
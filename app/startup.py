@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from sqlmodel import Session
+
+from .artifact_manager import DXMTArtifactManager, get_s3_client
+from .migrations import migrate
+from .utils import engine, get_bucket_name, get_endpoint_url, get_sources
+
+logger = logging.getLogger(__name__)
+
+# set when the app is imported, so the logged startup time includes the app's own imports
+IMPORTED_AT = time.perf_counter()
+
+
+class StartupState:
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+        self.timings: dict[str, float] = {}
+
+
+def _warm_caches(state: StartupState):
+    start = time.perf_counter()
+    get_s3_client(get_endpoint_url())
+    state.timings["s3_client"] = time.perf_counter() - start
+
+    # opens the pool's first connection and pulls the first page of the catalog into the DB cache
+    start = time.perf_counter()
+    with Session(engine) as session:
+        manager = DXMTArtifactManager(session, get_bucket_name(), endpoint_url=get_endpoint_url())
+        for source in get_sources():
+            manager.list_builds(page=1, source=source.name)
+    state.timings["catalog"] = time.perf_counter() - start
+
+
+async def warm_up(app: FastAPI):
+    """Prepare everything a request needs, then start syncing.
+
+    Runs in the background so the server accepts connections (and answers liveness
+    probes) right away; /health/ready only succeeds once this has finished.
+    """
+    state: StartupState = app.state.startup
+    try:
+        start = time.perf_counter()
+        await asyncio.to_thread(migrate, engine)
+        state.timings["migrations"] = time.perf_counter() - start
+
+        await asyncio.to_thread(_warm_caches, state)
+    except Exception as e:
+        state.error = repr(e)
+        logger.error(f"Startup failed: {e}", exc_info=True)
+        return
+
+    state.ready = True
+    state.timings["total"] = time.perf_counter() - IMPORTED_AT
+    logger.info(f"Ready to serve after {state.timings['total']:.2f}s: {state.timings}")
+
+    # the syncer pulls in requests and the GitHub client, none of which the API needs to serve
+    from .github import GitHubAPIClient
+    from .syncer import SyncScheduler
+
+    try:
+        # one GitHub client (and rate budget) shared by all sources
+        scheduler = SyncScheduler(GitHubAPIClient(), engine, get_bucket_name(), get_sources())
+    except Exception as e:
+        logger.error(f"Failed to start syncer: {e}", exc_info=True)
+        return
+    await scheduler.sync_loop()
@@ -1,55 +1,190 @@
 import asyncio
+import hashlib
 import logging
+import random
 import tarfile
 import tempfile
+import time
 import zipfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import List, Optional, Tuple
 
+from requests import HTTPError
+from sqlalchemy import Integer, cast, delete, func
 from sqlmodel import Session, select, col
 
 from .artifact_manager import DXMTArtifactManager
 from .github import GitHubAPIClient
-from .models.builds import BuiltinBuild, ReleaseBuild, BuiltinArtifact, ReleaseArtifact
-from .models.github import GitHubActionRun, GitHubRelease
-from .utils import get_endpoint_url
+from .manifests import ManifestPublisher
+from .models.builds import BuiltinBuild, ReleaseBuild, BuiltinArtifact, ReleaseArtifact, StagedArtifact
+from .models.github import GitHubActionArtifact, GitHubActionRun, GitHubRelease
+from .models.sources import UpstreamSource
+from .models.sync import IntegritySweep, SyncJob, SyncRun
+from .tracing import SamplingProfiler, SyncTrace
+from .verifier import IntegrityVerifier
+from .utils import (
+    get_endpoint_url, get_publish_manifests, get_sync_active_interval, get_sync_concurrency, get_sync_interval,
+    get_sync_job_max_attempts, get_sync_job_time_budget, get_sync_profile_dir, get_sync_profile_threshold,
+    get_sync_runs_retention, get_verify_batch_size, get_verify_interval,
+)
 
 logger = logging.getLogger(__name__)
 
+# issues kept per integrity sweep, the counters cover all of them
+MAX_SWEEP_ISSUES = 1000
+# finished sweeps kept per source
+SWEEP_RETENTION = 30
+
+# sync job priorities, lower runs first
+PRIORITY_RELEASE = 0
+PRIORITY_NEW_RUN = 10
+PRIORITY_BACKFILL = 20
+# runs older than this are backfill
+BACKFILL_AGE = timedelta(days=1)
+# backfill only runs while at least this share of the rate budget is left
+BACKFILL_MIN_BUDGET = 0.25
+JOB_BACKOFF_BASE = timedelta(minutes=1)
+JOB_BACKOFF_MAX = timedelta(hours=6)
+
+
+class SyncScheduler:
+    # Syncs every configured source on its own schedule. Sources run concurrently in worker
+    # threads and share one GitHub client, and with it one rate budget.
+    def __init__(
+        self, github_client: GitHubAPIClient, engine, bucket_name: str, sources: List[UpstreamSource],
+        interval: Optional[float] = None, active_interval: Optional[float] = None,
+    ):
+        self.syncers = [ArtifactSyncer(github_client, engine, bucket_name, source) for source in sources]
+        self.interval = get_sync_interval() if interval is None else interval
+        # while CI runs are in progress their artifacts are polled more often
+        self.active_interval = get_sync_active_interval() if active_interval is None else active_interval
+        self.concurrency = max(1, get_sync_concurrency())
+
+    async def sync_loop(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        # one loop per source, so a source with runs in progress is not held up by a slow one
+        async def loop(syncer: "ArtifactSyncer"):
+            while True:
+                async with semaphore:
+                    try:
+                        # Run the blocking sync cycle in a separate thread to avoid blocking the event loop
+                        await asyncio.to_thread(syncer._run_sync_cycle)
+                    except Exception as e:
+                        logger.error(f"Error in sync cycle for {syncer.source.name}: {e}", exc_info=True)
+                active = syncer.active_runs > 0
+                await asyncio.sleep(min(self.interval, self.active_interval) if active else self.interval)
+
+        await asyncio.gather(*(loop(syncer) for syncer in self.syncers))
+
+
 class ArtifactSyncer:
-    def __init__(self, github_client: GitHubAPIClient, engine, bucket_name: str):
+    def __init__(self, github_client: GitHubAPIClient, engine, bucket_name: str, source: UpstreamSource):
         self.github_client = github_client
         self.engine = engine
         self.bucket_name = bucket_name
-        self.owner = "3Shain"
-        self.repo = "dxmt"
-
-    async def sync_loop(self):
-        while True:
-            try:
-                # Run the blocking sync cycle in a separate thread to avoid blocking the event loop
-                await asyncio.to_thread(self._run_sync_cycle)
-            except Exception as e:
-                logger.error(f"Error in sync cycle: {e}", exc_info=True)
-
-            await asyncio.sleep(60)
+        self.source = source
+        self.owner = source.owner
+        self.repo = source.repo
+        self.trace = SyncTrace()
+        # the catalog manifests are (re)published on the first cycle and whenever builds were added
+        self._catalog_published = False
+        # in-progress runs seen by the last cycle, the scheduler polls more often while there are any
+        self.active_runs = 0
+        # run id -> ids of GitHub artifacts already prefetched in this process
+        self._prefetched_artifacts: dict[int, set] = {}
 
     def _run_sync_cycle(self):
-        logger.info("Starting sync cycle...")
-        with Session(self.engine) as session:
-            artifact_manager = DXMTArtifactManager(session, self.bucket_name, endpoint_url=get_endpoint_url())
-            self.sync_builtin_builds(session, artifact_manager)
-            self.sync_releases(session, artifact_manager)
-        logger.info("Sync cycle completed.")
+        logger.info(f"Starting sync cycle for {self.source.name} ({self.owner}/{self.repo})...")
+        self.trace = SyncTrace()
+        profiler = SamplingProfiler().start() if get_sync_profile_dir() else None
+        error = None
+        try:
+            with Session(self.engine) as session:
+                artifact_manager = DXMTArtifactManager(session, self.bucket_name, endpoint_url=get_endpoint_url())
+                # discovery only queues jobs; a failure there must not stop the queue from draining
+                try:
+                    if self.source.sync_releases:
+                        self.sync_releases(session, artifact_manager)
+                    if self.source.sync_builds:
+                        self.sync_builtin_builds(session, artifact_manager)
+                except Exception as e:
+                    logger.error(f"Discovery for {self.source.name} failed: {e}", exc_info=True)
+                    session.rollback()
+                    error = e
+                self.dispatch_jobs(session, artifact_manager)
+                if self.source.sync_builds and self.source.prefetch_in_progress:
+                    self.prefetch_in_progress_runs(session, artifact_manager)
+                builds_added = any("db.commit" in item["stages"] for item in self.trace.items)
+                if builds_added or not self._catalog_published:
+                    self._publish_catalog(session, artifact_manager)
+                if get_verify_batch_size() > 0:
+                    self.verify_integrity(session, artifact_manager)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.trace.finish()
+            if profiler:
+                profiler.stop()
+            self._save_sync_run(self.trace, error, profiler)
+        logger.info(f"Sync cycle for {self.source.name} completed: {self.trace.summary()}")
+
+    def _save_sync_run(self, trace: SyncTrace, error: Optional[Exception], profiler: Optional[SamplingProfiler]):
+        profile_path = None
+        if profiler and trace.duration >= get_sync_profile_threshold():
+            path = Path(get_sync_profile_dir()) / f"sync-{self.source.name}-{trace.started_at:%Y%m%dT%H%M%S%f}.folded"
+            profile_path = str(profiler.write_folded(path))
+            logger.info(f"Sync cycle took {trace.duration:.1f}s, wrote profile to {profile_path}")
+
+        upload = trace.stages.get("s3.upload", {})
+        sync_run = SyncRun(
+            source=self.source.name,
+            started_at=trace.started_at,
+            duration=trace.duration,
+            status="failed" if error else "success",
+            error=repr(error) if error else None,
+            builds_synced=sum(1 for item in trace.items if "db.commit" in item["stages"]),
+            bytes_uploaded=upload.get("bytes", 0),
+            files_uploaded=upload.get("items", 0),
+            stages=trace.stages,
+            items=trace.items,
+            profile_path=profile_path,
+        )
+
+        # a failure to record the run must not hide the outcome of the sync itself
+        try:
+            with Session(self.engine) as session:
+                session.add(sync_run)
+                session.commit()
+
+                cutoff = session.exec(
+                    select(SyncRun.id)
+                    .where(SyncRun.source == self.source.name)
+                    .order_by(col(SyncRun.id).desc())
+                    .offset(get_sync_runs_retention())
+                ).first()
+                if cutoff is not None:
+                    session.execute(delete(SyncRun).where(SyncRun.source == self.source.name, col(SyncRun.id) <= cutoff))
+                    session.commit()
+        except Exception as e:
+            logger.error(f"Failed to record sync run: {e}", exc_info=True)
 
     def sync_builtin_builds(self, session: Session, artifact_manager: DXMTArtifactManager):
         logger.info("Syncing builtin builds...")
-        # Get the latest build we have in DB
+        # Get the latest build we have in DB, or have queued
         latest_build = session.exec(
-            select(BuiltinBuild).order_by(col(BuiltinBuild.created_at).desc())
+            select(BuiltinBuild)
+            .where(BuiltinBuild.source == self.source.name)
+            .order_by(col(BuiltinBuild.created_at).desc())
+        ).first()
+        latest_job = session.exec(
+            select(func.max(cast(SyncJob.target, Integer)))
+            .where(SyncJob.source == self.source.name, SyncJob.kind == "builtin")
         ).first()
 
-        latest_run_id = latest_build.github_run_id if latest_build else 0
+        latest_run_id = max(latest_build.github_run_id if latest_build else 0, latest_job or 0)
 
         new_runs = []
         page = 1
@@ -57,7 +192,9 @@ class ArtifactSyncer:
 
         while should_continue:
             # Fetch runs from GitHub
-            runs_response = self.github_client.get_action_runs(self.owner, self.repo, page=page, status="success")
+            with self.trace.span("github.list_runs", page=page) as span:
+                runs_response = self.github_client.get_action_runs(self.owner, self.repo, page=page, status="success")
+                span.set(count=len(runs_response.workflow_runs))
 
             if not runs_response.workflow_runs:
                 break
@@ -67,15 +204,15 @@ class ArtifactSyncer:
                     should_continue = False
                     break
 
-                # if the run date is older than 4 months, stop processing further
-                if run.created_at < datetime.now(timezone.utc) - timedelta(days=100):
+                # if the run is older than the source's max age, stop processing further
+                if self._is_too_old(run):
                     should_continue = False
                     break
 
                 # Filter out runs that are not successful or are native builds
                 # status="success" filter handles status/conclusion check
 
-                if "native" in run.path:
+                if not self.source.accepts_workflow(run.path):
                     continue
 
                 new_runs.append(run)
@@ -85,106 +222,258 @@ class ArtifactSyncer:
 
             page += 1
 
-        # Process new runs (oldest first to maintain order if we stop)
-        for run in reversed(new_runs):
-            self._process_builtin_run(run, session, artifact_manager)
+        backfill_before = datetime.now(timezone.utc) - BACKFILL_AGE
+        for run in new_runs:
+            priority = PRIORITY_NEW_RUN if run.created_at >= backfill_before else PRIORITY_BACKFILL
+            self._enqueue(session, "builtin", str(run.id), priority, run.created_at, run)
+        session.commit()
+
+    def _is_too_old(self, run: GitHubActionRun) -> bool:
+        return run.created_at < datetime.now(timezone.utc) - timedelta(days=self.source.max_age_days)
+
+    def _accepts_run(self, run: GitHubActionRun) -> bool:
+        return not self._is_too_old(run) and self.source.accepts_workflow(run.path)
+
+    def _ingest_artifact(self, run_id: int, artifact: GitHubActionArtifact, temp_path: Path) -> list:
+        """Download and extract one GitHub artifact, returning the (local path, db artifact) pairs to upload."""
+        is_wow64_artifact = self.source.is_wow64_artifact(artifact.name)
+
+        # Download artifact zip
+        logger.info(f"Downloading artifact {artifact.name} from run {run_id}")
+        zip_path = temp_path / f"{artifact.name}.zip"
+        with self.trace.span("github.download") as span:
+            self.github_client.download_artifact(zip_path, self.owner, self.repo, artifact.id)
+            span.set(bytes=zip_path.stat().st_size, count=1)
+
+        # Extract zip
+        extract_dir = temp_path / artifact.name
+        with self.trace.span("extract.zip") as span, zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            zip_ref.extractall(extract_dir)
+            span.set(count=len(zip_ref.infolist()))
+
+        # Find and extract tar.gz inside
+        tar_files = list(extract_dir.glob("*.tar.gz"))
+        if not tar_files:
+            logger.warning(f"No tar.gz found in artifact {artifact.name}")
+            return []
+
+        tar_path = tar_files[0]
+        tar_extract_dir = extract_dir / "extracted"
+        with self.trace.span("extract.tar") as span, tarfile.open(tar_path, "r:gz") as tar_ref:
+            tar_ref.extractall(tar_extract_dir)
+            span.set(count=len(tar_ref.getmembers()))
+
+        uploads = []
+        # Inspect extracted files
+        for file_path in tar_extract_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+
+            # Filter files based on artifact type
+            if not self.source.accepts_file(file_path.suffix, is_wow64_artifact):
+                continue
+
+            # Create DB object
+            db_artifact = BuiltinArtifact(
+                source=self.source.name,
+                artifact_id=artifact.id,
+                build_id=run_id,
+                name=file_path.name,
+                is_wow64=is_wow64_artifact
+            )
+
+            uploads.append((file_path, db_artifact))
+        return uploads
+
+    def _wanted_artifacts(self, artifacts: List[GitHubActionArtifact], skip_ids: set) -> List[GitHubActionArtifact]:
+        # Filter artifacts by the source's name patterns (e.g. release builds, no gcc builds)
+        return [
+            artifact for artifact in artifacts
+            if not artifact.expired and self.source.accepts_artifact(artifact.name) and artifact.id not in skip_ids
+        ]
 
     def _process_builtin_run(self, run: GitHubActionRun, session: Session, artifact_manager: DXMTArtifactManager):
         logger.info(f"Processing new run: {run.id}")
 
+        # Files already uploaded while the run was in progress
+        staged = session.exec(
+            select(StagedArtifact).where(StagedArtifact.source == self.source.name, StagedArtifact.run_id == run.id)
+        ).all()
+        if session.get(BuiltinBuild, run.id) is not None:
+            # already published, e.g. promoted by prefetch_in_progress_runs; staged rows are leftovers
+            for s in staged:
+                session.delete(s)
+            session.commit()
+            return
+
         # Fetch artifacts for this run
-        artifacts_response = self.github_client.get_run_artifacts(self.owner, self.repo, run.id)
+        with self.trace.span("github.list_artifacts") as span:
+            artifacts_response = self.github_client.get_run_artifacts(self.owner, self.repo, run.id)
+            span.set(count=len(artifacts_response.artifacts))
 
-        if not artifacts_response.artifacts:
+        if not artifacts_response.artifacts and not staged:
             logger.info(f"Run {run.id} has no artifacts. Skipping.")
             return
 
-        has_wow64 = False
-        processed_artifacts = []
+        skip_ids = {s.artifact_id for s in staged} | self._prefetched_artifacts.get(run.id, set())
+        uploads = []
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
 
-            for artifact in artifacts_response.artifacts:
-                if artifact.expired:
-                    continue
-
-                # Filter artifacts: skip gcc builds
-                if "-gcc" in artifact.name.lower():
-                    continue
-
-                if "release" not in artifact.name.lower():
-                    continue
-
-                is_wow64_artifact = "wow64" in artifact.name.lower()
+            for artifact in self._wanted_artifacts(artifacts_response.artifacts, skip_ids):
+                uploads.extend(self._ingest_artifact(run.id, artifact, temp_path))
 
-                # Download artifact zip
-                logger.info(f"Downloading artifact {artifact.name} from run {run.id}")
-                zip_path = temp_path / f"{artifact.name}.zip"
-                self.github_client.download_artifact(zip_path, self.owner, self.repo, artifact.id)
-
-                # Extract zip
-                extract_dir = temp_path / artifact.name
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-
-                # Find and extract tar.gz inside
-                tar_files = list(extract_dir.glob("*.tar.gz"))
-                if not tar_files:
-                    logger.warning(f"No tar.gz found in artifact {artifact.name}")
-                    continue
-
-                tar_path = tar_files[0]
-                tar_extract_dir = extract_dir / "extracted"
-                with tarfile.open(tar_path, "r:gz") as tar_ref:
-                    tar_ref.extractall(tar_extract_dir)
-
-                # Inspect extracted files
-                for file_path in tar_extract_dir.rglob("*"):
-                    if not file_path.is_file():
-                        continue
-
-                    # Filter files based on artifact type
-                    if is_wow64_artifact:
-                        if file_path.suffix != ".dll":
-                            continue
-                        has_wow64 = True
-                    else:
-                        if file_path.suffix not in [".dll", ".so"]:
-                            continue
-
-                    # Create DB object
-                    db_artifact = BuiltinArtifact(
-                        artifact_id=artifact.id,
-                        build_id=run.id,
-                        name=file_path.name,
-                        is_wow64=is_wow64_artifact
-                    )
-
-                    # Upload to S3
-                    key = artifact_manager._get_s3_key(db_artifact)
-                    artifact_manager.s3_client.upload_file(str(file_path), artifact_manager.bucket_name, key)
-                    processed_artifacts.append(db_artifact)
+            # Upload every file of the run to S3 as one concurrent batch
+            self._upload_batch(uploads, artifact_manager)
 
+        processed_artifacts = [s.to_builtin_artifact() for s in staged] + [db_artifact for _, db_artifact in uploads]
         if not processed_artifacts:
             logger.info(f"Run {run.id} has no relevant artifacts. Skipping.")
             return
 
         # Save build and artifacts to DB
         build = BuiltinBuild(
+            source=self.source.name,
             github_run_id=run.id,
             commit_sha=run.head_sha,
             description=run.display_title,
             created_at=run.created_at,
             artifact_count=len(processed_artifacts),
-            has_wow64=has_wow64
+            has_wow64=any(art.is_wow64 for art in processed_artifacts)
         )
 
-        session.add(build)
-        for art in processed_artifacts:
-            session.add(art)
+        with self.trace.span("db.commit", count=len(processed_artifacts)):
+            session.add(build)
+            for art in processed_artifacts:
+                session.add(art)
+            # the build is published, its staged files are now regular artifacts
+            for s in staged:
+                session.delete(s)
+            session.commit()
+        self._prefetched_artifacts.pop(run.id, None)
+        logger.info(f"Saved run {run.id} with {len(processed_artifacts)} artifacts ({len(staged)} prefetched)")
+        self._publish_build(build, session, artifact_manager)
+
+    def prefetch_in_progress_runs(self, session: Session, artifact_manager: DXMTArtifactManager):
+        """Ingest artifacts of runs that are still in progress as soon as they appear.
+
+        Files are uploaded to their final S3 keys and recorded as StagedArtifact rows,
+        which stay out of the catalog. When the run concludes, the files are either
+        promoted with the build (success) or deleted again (anything else). Re-runs of
+        builds that are already in the catalog are not prefetched.
+        """
+        logger.info("Prefetching in-progress runs...")
+        # prefetching only gets builds out sooner; its failures must not stop the rest of the cycle
+        in_progress = []
+        page = 1
+        try:
+            while True:
+                with self.trace.span("github.list_runs", page=page, status="in_progress") as span:
+                    runs_response = self.github_client.get_action_runs(self.owner, self.repo, page=page, status="in_progress")
+                    span.set(count=len(runs_response.workflow_runs))
+                in_progress.extend(run for run in runs_response.workflow_runs if self._accepts_run(run))
+                if len(runs_response.workflow_runs) < 30:
+                    break
+                page += 1
+        except Exception as e:
+            logger.error(f"Failed to list in-progress runs of {self.source.name}: {e}", exc_info=True)
+            return
+
+        staged_run_ids = set(session.exec(
+            select(StagedArtifact.run_id).where(StagedArtifact.source == self.source.name).distinct()
+        ).all())
+        in_progress_ids = {run.id for run in in_progress}
+
+        # Staged runs that are no longer in progress have concluded since the last cycle
+        for run_id in sorted(staged_run_ids - in_progress_ids):
+            try:
+                self._settle_staged_run(run_id, in_progress_ids, session, artifact_manager)
+            except Exception as e:
+                logger.error(f"Failed to settle prefetched run {run_id}: {e}", exc_info=True)
+                session.rollback()
+
+        for run in in_progress:
+            try:
+                with self.trace.item("prefetch", run.id):
+                    self._prefetch_run(run, session, artifact_manager)
+            except Exception as e:
+                logger.error(f"Failed to prefetch run {run.id}: {e}", exc_info=True)
+                session.rollback()
+
+        self.active_runs = len(in_progress_ids)
+
+    def _settle_staged_run(self, run_id: int, in_progress_ids: set, session: Session, artifact_manager: DXMTArtifactManager):
+        try:
+            with self.trace.span("github.get_run"):
+                run = self.github_client.get_action_run(self.owner, self.repo, run_id)
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            # the run was deleted on GitHub, it will never succeed
+            logger.info(f"Run {run_id} no longer exists, discarding prefetched files")
+            self._discard_staged_run(run_id, session, artifact_manager)
+            return
+
+        if run.status != "completed":
+            # queued again, e.g. re-run; keep what was staged
+            in_progress_ids.add(run_id)
+        elif run.conclusion == "success":
+            # promote now, the run may be older than the newest build and skipped by sync_builtin_builds
+            with self.trace.item("builtin", run.id):
+                self._process_builtin_run(run, session, artifact_manager)
+        else:
+            logger.info(f"Run {run_id} concluded with {run.conclusion}, discarding prefetched files")
+            self._discard_staged_run(run_id, session, artifact_manager)
+
+    def _prefetch_run(self, run: GitHubActionRun, session: Session, artifact_manager: DXMTArtifactManager):
+        if session.get(BuiltinBuild, run.id) is not None:
+            # a re-run of a mirrored build; staging would overwrite the published files
+            return
+        with self.trace.span("github.list_artifacts") as span:
+            artifacts_response = self.github_client.get_run_artifacts(self.owner, self.repo, run.id)
+            span.set(count=len(artifacts_response.artifacts))
+
+        staged_ids = set(session.exec(
+            select(StagedArtifact.artifact_id).where(StagedArtifact.source == self.source.name, StagedArtifact.run_id == run.id)
+        ).all())
+        seen = self._prefetched_artifacts.setdefault(run.id, set())
+        artifacts = self._wanted_artifacts(artifacts_response.artifacts, staged_ids | seen)
+        if not artifacts:
+            return
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            for artifact in artifacts:
+                uploads = self._ingest_artifact(run.id, artifact, temp_path)
+                self._upload_batch(uploads, artifact_manager)
+
+                with self.trace.span("db.stage", count=len(uploads)):
+                    for _, db_artifact in uploads:
+                        session.add(StagedArtifact.from_builtin_artifact(db_artifact))
+                    session.commit()
+                # artifacts without matching files leave no rows, remember them for this process
+                seen.add(artifact.id)
+                logger.info(f"Prefetched artifact {artifact.name} of in-progress run {run.id} ({len(uploads)} files)")
+
+    def _discard_staged_run(self, run_id: int, session: Session, artifact_manager: DXMTArtifactManager):
+        staged = session.exec(
+            select(StagedArtifact).where(StagedArtifact.source == self.source.name, StagedArtifact.run_id == run_id)
+        ).all()
+        # a published build shares its keys with staged files of the same run, those stay
+        build = session.get(BuiltinBuild, run_id)
+        published = {artifact_manager._get_s3_key(a) for a in build.artifacts} if build else set()
+        keys = [key for key in (artifact_manager._get_s3_key(s.to_builtin_artifact()) for s in staged) if key not in published]
+        with self.trace.span("s3.delete", count=len(keys)):
+            failed = artifact_manager.delete_objects(keys)
+        if failed:
+            # the rows stay, so the next cycle tries again
+            logger.warning(f"Failed to delete {len(failed)} prefetched files of run {run_id}: {failed[:5]}")
+            return
+        for s in staged:
+            session.delete(s)
         session.commit()
-        logger.info(f"Saved run {run.id} with {len(processed_artifacts)} artifacts")
+        self._prefetched_artifacts.pop(run_id, None)
 
     def sync_releases(self, session: Session, artifact_manager: DXMTArtifactManager):
         logger.info("Syncing releases...")
@@ -195,14 +484,18 @@ class ArtifactSyncer:
 
         while should_continue:
             # Fetch releases
-            releases = self.github_client.get_releases(self.owner, self.repo, page=page)
+            with self.trace.span("github.list_releases", page=page) as span:
+                releases = self.github_client.get_releases(self.owner, self.repo, page=page)
+                span.set(count=len(releases))
 
             if not releases:
                 break
 
             for release in releases:
-                # Check if we already have this tag
-                existing = session.get(ReleaseBuild, release.tag_name)
+                # Check if we already have (or have queued) this tag
+                existing = session.get(ReleaseBuild, (self.source.name, release.tag_name)) or self._get_job(
+                    session, "release", release.tag_name
+                )
                 if existing:
                     should_continue = False
                     break # Assume ordered by date
@@ -214,8 +507,104 @@ class ArtifactSyncer:
 
             page += 1
 
-        for release in reversed(new_releases):
-            self._process_release(release, session, artifact_manager)
+        for release in new_releases:
+            self._enqueue(session, "release", release.tag_name, PRIORITY_RELEASE, release.created_at, release)
+        session.commit()
+
+    def _get_job(self, session: Session, kind: str, target: str) -> Optional[SyncJob]:
+        return session.exec(
+            select(SyncJob).where(SyncJob.source == self.source.name, SyncJob.kind == kind, SyncJob.target == target)
+        ).first()
+
+    def _enqueue(self, session: Session, kind: str, target: str, priority: int, created_at: datetime, payload):
+        if self._get_job(session, kind, target) is not None:
+            return
+        session.add(SyncJob(
+            source=self.source.name,
+            kind=kind,
+            target=target,
+            priority=priority,
+            upstream_created_at=created_at,
+            next_attempt_at=datetime.now(timezone.utc),
+            payload=payload.model_dump(mode="json"),
+        ))
+        logger.info(f"Queued {kind} {target} with priority {priority}")
+
+    def dispatch_jobs(self, session: Session, artifact_manager: DXMTArtifactManager):
+        """Run queued jobs, highest priority and newest first, until none is due or the cycle's time is up.
+
+        GitHub requests are paced by the client's rate budget. Backfill waits while less than
+        BACKFILL_MIN_BUDGET of the rate budget is left, keeping it for new releases and runs.
+        A failing job is retried with exponential backoff, capped at JOB_BACKOFF_MAX, and marked
+        failed after SYNC_JOB_MAX_ATTEMPTS; failed jobs are still retried at that pace.
+        """
+        deadline = time.monotonic() + get_sync_job_time_budget()
+        skipped_backfill = False
+        while time.monotonic() < deadline:
+            query = select(SyncJob).where(
+                SyncJob.source == self.source.name,
+                col(SyncJob.status).in_(("pending", "failed")),
+                SyncJob.next_attempt_at <= datetime.now(timezone.utc),
+            )
+            if self.github_client.rate_budget.usable_fraction() < BACKFILL_MIN_BUDGET:
+                query = query.where(SyncJob.priority < PRIORITY_BACKFILL)
+                skipped_backfill = True
+            job = session.exec(
+                query.order_by(col(SyncJob.priority), col(SyncJob.upstream_created_at).desc())
+            ).first()
+            if job is None:
+                break
+            self._run_job(job, session, artifact_manager)
+
+        pending = session.exec(
+            select(func.count()).select_from(SyncJob).where(SyncJob.source == self.source.name, SyncJob.status == "pending")
+        ).one()
+        if pending:
+            logger.info(f"{pending} sync jobs pending for {self.source.name}"
+                        + (" (backfill paused, rate budget low)" if skipped_backfill else ""))
+        self._prune_jobs(session)
+
+    def _run_job(self, job: SyncJob, session: Session, artifact_manager: DXMTArtifactManager):
+        job_id = job.id
+        try:
+            with self.trace.item(job.kind, job.target):
+                if job.kind == "builtin":
+                    self._process_builtin_run(GitHubActionRun.model_validate(job.payload), session, artifact_manager)
+                elif session.get(ReleaseBuild, (self.source.name, job.target)) is None:
+                    self._process_release(GitHubRelease.model_validate(job.payload), session, artifact_manager)
+        except Exception as e:
+            # the session may hold half of the job's rows
+            session.rollback()
+            job = session.get(SyncJob, job_id)
+            job.attempts += 1
+            job.last_error = repr(e)
+            # failed jobs keep being retried, an outage must not drop the work queued during it
+            backoff = min(JOB_BACKOFF_BASE * 2 ** (job.attempts - 1), JOB_BACKOFF_MAX)
+            job.next_attempt_at = datetime.now(timezone.utc) + backoff * random.uniform(0.8, 1.2)
+            if job.attempts >= get_sync_job_max_attempts():
+                job.status = "failed"
+                logger.error(f"Sync job {job.kind} {job.target} failed {job.attempts} times, "
+                             f"retrying in {backoff.total_seconds():.0f}s: {e}", exc_info=True)
+            else:
+                logger.warning(f"Sync job {job.kind} {job.target} failed (attempt {job.attempts}), "
+                               f"retrying in {backoff.total_seconds():.0f}s: {e}")
+        else:
+            job.status = "done"
+            job.last_error = None
+        session.add(job)
+        session.commit()
+
+    def _prune_jobs(self, session: Session):
+        # finished jobs are only needed while discovery can still list their run or release;
+        # failed runs past the source's max age would not be synced any more, they stop being retried
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.source.max_age_days + 1)
+        session.execute(delete(SyncJob).where(
+            SyncJob.source == self.source.name,
+            SyncJob.kind == "builtin",
+            SyncJob.status != "pending",
+            SyncJob.upstream_created_at < cutoff,
+        ))
+        session.commit()
 
     def _process_release(self, release: GitHubRelease, session: Session, artifact_manager: DXMTArtifactManager):
         logger.info(f"Processing new release: {release.tag_name}")
@@ -223,82 +612,267 @@ class ArtifactSyncer:
         if not release.assets:
             logger.info(f"Skipping release {release.tag_name} (no assets)")
             # We still save the build to avoid reprocessing, but with 0 artifacts
-            self._save_release_build(release, [], False, session)
+            self._save_release_build(release, [], False, session, artifact_manager)
             return
 
-        asset = release.assets[0]
-        has_wow64 = False
-        processed_artifacts = []
-
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Download asset
-            asset_path = temp_path / asset.name
-            self.github_client.download_release_asset(asset_path, self.owner, self.repo, asset.id)
-
-            # Extract tar.gz
-            extract_dir = temp_path / "extracted"
-            try:
-                with tarfile.open(asset_path, "r:gz") as tar_ref:
-                    tar_ref.extractall(extract_dir)
-            except Exception as e:
-                logger.error(f"Failed to extract release asset {asset.name}: {e}")
-                self._save_release_build(release, [], False, session)
+            result = self._ingest_release(release, Path(temp_dir))
+            if result is None:
+                self._save_release_build(release, [], False, session, artifact_manager)
                 return
+            uploads, has_wow64 = result
 
-            # Check folders and upload
-            # use glob to find the expected folders
-            def find_folder(name):
-                matches = [p for p in extract_dir.rglob(name) if p.is_dir()]
-                if len(matches) > 1:
-                    raise ValueError(f"Found multiple folders named {name} in release artifact")
-                return matches[0] if matches else None
+            self._upload_batch(uploads, artifact_manager)
 
-            i386_windows = find_folder("i386-windows")
-            x86_64_windows = find_folder("x86_64-windows")
-            x86_64_unix = find_folder("x86_64-unix")
+        self._save_release_build(release, [db_artifact for _, db_artifact in uploads], has_wow64, session, artifact_manager)
 
-            if i386_windows:
-                logger.info(f"Found i386-windows folder in release {release.tag_name}, marking as wow64")
-                has_wow64 = True
-                self._upload_release_files(release, i386_windows, True, processed_artifacts, artifact_manager)
+    def _ingest_release(self, release: GitHubRelease, temp_path: Path) -> Optional[Tuple[list, bool]]:
+        """Download and extract the release asset, returning the (local path, db artifact) pairs to upload and whether
+        it has wow64 files. None if the asset could not be extracted."""
+        asset = release.assets[0]
+        has_wow64 = False
+        uploads = []
 
-            if x86_64_windows:
-                logger.info(f"Found x86_64-windows folder in release {release.tag_name}")
-                self._upload_release_files(release, x86_64_windows, False, processed_artifacts, artifact_manager)
+        # Download asset
+        asset_path = temp_path / asset.name
+        with self.trace.span("github.download") as span:
+            self.github_client.download_release_asset(asset_path, self.owner, self.repo, asset.id)
+            span.set(bytes=asset_path.stat().st_size, count=1)
+
+        # Extract tar.gz
+        extract_dir = temp_path / "extracted"
+        try:
+            with self.trace.span("extract.tar") as span, tarfile.open(asset_path, "r:gz") as tar_ref:
+                tar_ref.extractall(extract_dir)
+                span.set(count=len(tar_ref.getmembers()))
+        except Exception as e:
+            logger.error(f"Failed to extract release asset {asset.name}: {e}")
+            return None
+
+        # Check folders
+        # use glob to find the expected folders
+        def find_folder(name):
+            matches = [p for p in extract_dir.rglob(name) if p.is_dir()]
+            if len(matches) > 1:
+                raise ValueError(f"Found multiple folders named {name} in release artifact")
+            return matches[0] if matches else None
+
+        for name in self.source.release_wow64_folders:
+            folder = find_folder(name)
+            if folder:
+                logger.info(f"Found {name} folder in release {release.tag_name}, marking as wow64")
+                has_wow64 = True
+                self._collect_release_files(release, folder, True, uploads)
 
-            if x86_64_unix:
-                logger.info(f"Found x86_64-unix folder in release {release.tag_name}")
-                self._upload_release_files(release, x86_64_unix, False, processed_artifacts, artifact_manager)
+        for name in self.source.release_folders:
+            folder = find_folder(name)
+            if folder:
+                logger.info(f"Found {name} folder in release {release.tag_name}")
+                self._collect_release_files(release, folder, False, uploads)
 
-        self._save_release_build(release, processed_artifacts, has_wow64, session)
+        return uploads, has_wow64
 
-    def _upload_release_files(self, release: GitHubRelease, directory: Path, is_wow64: bool, processed_list: list, artifact_manager: DXMTArtifactManager):
+    def _collect_release_files(self, release: GitHubRelease, directory: Path, is_wow64: bool, uploads: list):
         for file_path in directory.rglob("*"):
             if not file_path.is_file():
                 continue
 
             db_artifact = ReleaseArtifact(
+                source=self.source.name,
                 build_tag=release.tag_name,
                 name=file_path.name,
                 is_wow64=is_wow64
             )
 
-            key = artifact_manager._get_s3_key(db_artifact)
-            artifact_manager.s3_client.upload_file(str(file_path), artifact_manager.bucket_name, key)
-            processed_list.append(db_artifact)
+            uploads.append((file_path, db_artifact))
 
-    def _save_release_build(self, release: GitHubRelease, artifacts: list, has_wow64: bool, session: Session):
+    def _upload_batch(self, uploads: list, artifact_manager: DXMTArtifactManager):
+        # uploads holds (local path, db artifact) pairs
+        if not uploads:
+            return
+        with self.trace.span("hash", count=len(uploads)) as span:
+            for file_path, db_artifact in uploads:
+                with open(file_path, "rb") as f:
+                    db_artifact.sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+                db_artifact.size = file_path.stat().st_size
+            span.set(bytes=sum(db_artifact.size for _, db_artifact in uploads))
+        files = [(file_path, artifact_manager._get_s3_key(db_artifact)) for file_path, db_artifact in uploads]
+        with self.trace.span("s3.upload", count=len(files)) as span:
+            span.set(bytes=artifact_manager.upload_service.upload_files(files))
+
+    def _save_release_build(self, release: GitHubRelease, artifacts: list, has_wow64: bool, session: Session, artifact_manager: DXMTArtifactManager):
         build = ReleaseBuild(
+            source=self.source.name,
             tag=release.tag_name,
             created_at=release.created_at,
             artifact_count=len(artifacts),
             has_wow64=has_wow64
         )
 
-        session.add(build)
-        for art in artifacts:
-            session.add(art)
-        session.commit()
+        with self.trace.span("db.commit", count=len(artifacts)):
+            session.add(build)
+            for art in artifacts:
+                session.add(art)
+            session.commit()
         logger.info(f"Saved release {release.tag_name} with {len(artifacts)} artifacts")
+        self._publish_build(build, session, artifact_manager)
+
+    def verify_integrity(self, session: Session, artifact_manager: DXMTArtifactManager):
+        """Advance the source's integrity sweep by one batch and upload missing or damaged files again."""
+        sweep = session.exec(
+            select(IntegritySweep).where(IntegritySweep.source == self.source.name, col(IntegritySweep.finished_at).is_(None))
+        ).first()
+        if sweep is None:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=get_verify_interval())
+            recent = session.exec(
+                select(IntegritySweep.id).where(IntegritySweep.source == self.source.name, IntegritySweep.finished_at >= cutoff)
+            ).first()
+            if recent is not None:
+                return
+            sweep = IntegritySweep(source=self.source.name, started_at=datetime.now(timezone.utc))
+
+        try:
+            with self.trace.span("verify.list") as span:
+                batch = IntegrityVerifier(session, artifact_manager, self.source.name).check(sweep.cursor, get_verify_batch_size())
+                span.set(count=batch.checked)
+            damaged = batch.missing + [artifact for artifact, _ in batch.size_mismatched]
+            repaired = self._repair_files(damaged, session, artifact_manager) if damaged else []
+        except Exception as e:
+            logger.error(f"Integrity check for {self.source.name} failed: {e}", exc_info=True)
+            session.rollback()
+            return
+
+        issues = [
+            {"key": artifact_manager._get_s3_key(a), "problem": "missing", "expected_size": a.size, "actual_size": None}
+            for a in batch.missing
+        ] + [
+            {"key": artifact_manager._get_s3_key(a), "problem": "size_mismatch", "expected_size": a.size, "actual_size": size}
+            for a, size in batch.size_mismatched
+        ] + [
+            {"key": key, "problem": "orphaned", "expected_size": None, "actual_size": None}
+            for key in batch.orphaned
+        ]
+        repaired_keys = {artifact_manager._get_s3_key(a) for a in repaired}
+        for issue in issues:
+            issue["repaired"] = issue["key"] in repaired_keys
+        sweep.cursor = batch.cursor or sweep.cursor
+        sweep.objects_checked += batch.checked
+        sweep.missing += len(batch.missing)
+        sweep.orphaned += len(batch.orphaned)
+        sweep.size_mismatched += len(batch.size_mismatched)
+        sweep.repaired += len(repaired)
+        # a new list, so the JSON column is written
+        sweep.issues = (sweep.issues + issues)[:MAX_SWEEP_ISSUES]
+        if batch.done:
+            sweep.finished_at = datetime.now(timezone.utc)
+        session.add(sweep)
+        session.commit()
+
+        # the build manifests list sizes and hashes, which repairs and backfilled sizes changed
+        for build in {id(a.build): a.build for a in [*repaired, *batch.backfilled]}.values():
+            self._publish_build(build, session, artifact_manager)
+
+        if issues:
+            logger.warning(f"Integrity check for {self.source.name}: {len(batch.missing)} missing, "
+                           f"{len(batch.orphaned)} orphaned, {len(batch.size_mismatched)} size mismatches, "
+                           f"{len(repaired)} repaired")
+        if batch.done:
+            logger.info(f"Integrity sweep {sweep.id} for {self.source.name} finished: {sweep.objects_checked} objects, "
+                        f"{sweep.missing} missing, {sweep.orphaned} orphaned, {sweep.size_mismatched} size mismatches")
+            self._prune_sweeps(session)
+
+    def _prune_sweeps(self, session: Session):
+        cutoff = session.exec(
+            select(IntegritySweep.id)
+            .where(IntegritySweep.source == self.source.name)
+            .order_by(col(IntegritySweep.id).desc())
+            .offset(SWEEP_RETENTION)
+        ).first()
+        if cutoff is not None:
+            session.execute(delete(IntegritySweep).where(
+                IntegritySweep.source == self.source.name, col(IntegritySweep.id) <= cutoff
+            ))
+            session.commit()
+
+    def _repair_files(self, artifacts: list, session: Session, artifact_manager: DXMTArtifactManager) -> list:
+        """Download the given catalog files from GitHub again and upload them to their keys. Returns the repaired files."""
+        builtin, releases = {}, {}
+        for artifact in artifacts:
+            if isinstance(artifact, BuiltinArtifact):
+                builtin.setdefault(artifact.build_id, []).append(artifact)
+            else:
+                releases.setdefault(artifact.build_tag, []).append(artifact)
+
+        repaired = []
+        for run_id, group in builtin.items():
+            wanted = {(a.artifact_id, a.name, a.is_wow64): a for a in group}
+            try:
+                with self.trace.span("github.list_artifacts") as span:
+                    artifacts_response = self.github_client.get_run_artifacts(self.owner, self.repo, run_id, per_page=100)
+                    span.set(count=len(artifacts_response.artifacts))
+                artifact_ids = {a.artifact_id for a in group}
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    uploads = []
+                    for artifact in artifacts_response.artifacts:
+                        if artifact.expired or artifact.id not in artifact_ids:
+                            continue
+                        for file_path, fresh in self._ingest_artifact(run_id, artifact, Path(temp_dir)):
+                            existing = wanted.get((artifact.id, fresh.name, fresh.is_wow64))
+                            if existing is not None:
+                                uploads.append((file_path, existing))
+                    self._upload_batch(uploads, artifact_manager)
+                repaired.extend(db_artifact for _, db_artifact in uploads)
+            except Exception as e:
+                logger.warning(f"Failed to repair files of run {run_id}: {e}")
+
+        for tag, group in releases.items():
+            wanted = {(a.name, a.is_wow64): a for a in group}
+            try:
+                with self.trace.span("github.get_release"):
+                    release = self.github_client.get_release_by_tag(self.owner, self.repo, tag)
+                if not release.assets:
+                    continue
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    result = self._ingest_release(release, Path(temp_dir))
+                    if result is None:
+                        continue
+                    uploads = [
+                        (file_path, wanted[(fresh.name, fresh.is_wow64)])
+                        for file_path, fresh in result[0] if (fresh.name, fresh.is_wow64) in wanted
+                    ]
+                    self._upload_batch(uploads, artifact_manager)
+                repaired.extend(db_artifact for _, db_artifact in uploads)
+            except Exception as e:
+                logger.warning(f"Failed to repair files of release {tag}: {e}")
+
+        # sizes and hashes were recorded again by the upload
+        with self.trace.span("db.repair", count=len(repaired)):
+            for artifact in repaired:
+                session.add(artifact)
+            session.commit()
+
+        unrepaired = len(artifacts) - len(repaired)
+        if unrepaired:
+            logger.warning(f"{unrepaired} files of {self.source.name} could not be repaired, "
+                           f"their GitHub artifacts may have expired")
+        return repaired
+
+    def _publish_catalog(self, session: Session, artifact_manager: DXMTArtifactManager):
+        if not get_publish_manifests():
+            return
+        try:
+            with self.trace.span("manifest.catalog"):
+                ManifestPublisher(session, artifact_manager, self.source.name).publish_catalog()
+            self._catalog_published = True
+        except Exception as e:
+            logger.error(f"Failed to publish catalog manifests for {self.source.name}: {e}", exc_info=True)
+
+    def _publish_build(self, build, session: Session, artifact_manager: DXMTArtifactManager):
+        if not get_publish_manifests():
+            return
+        # manifests are derived from the catalog; a missing one is written again with the next catalog publish
+        try:
+            with self.trace.span("manifest.build"):
+                ManifestPublisher(session, artifact_manager, self.source.name).publish_build(build)
+        except Exception as e:
+            logger.error(f"Failed to publish manifest for {self.source.name} build: {e}", exc_info=True)
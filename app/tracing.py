@@ -0,0 +1,136 @@
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.duration = 0.0
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class SyncTrace:
+    """Collects timing spans for one sync cycle.
+
+    Spans are aggregated per stage (``github.list_runs``, ``s3.upload``...) and per
+    processed item (a run id or a release tag); individual spans are not kept since
+    a cold sync uploads thousands of files.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.duration = 0.0
+        self.stages: dict[str, dict] = {}
+        self.items: list[dict] = []
+        self._current_item: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        span = Span(name, attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            self._record(span)
+
+    @contextmanager
+    def item(self, kind: str, id):
+        item = {"kind": kind, "id": str(id), "seconds": 0.0, "bytes": 0, "files": 0, "stages": {}}
+        self._current_item = item
+        start = time.perf_counter()
+        try:
+            yield item
+        finally:
+            item["seconds"] = time.perf_counter() - start
+            self._current_item = None
+            with self._lock:
+                self.items.append(item)
+
+    def _record(self, span: Span):
+        logger.debug(f"span {span.name} took {span.duration:.3f}s {span.attributes}")
+        with self._lock:
+            _accumulate(self.stages, span)
+            if self._current_item is not None:
+                _accumulate(self._current_item["stages"], span)
+                if span.name == "s3.upload":
+                    self._current_item["files"] += span.attributes.get("count", 0)
+                    self._current_item["bytes"] += span.attributes.get("bytes", 0)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    def summary(self) -> str:
+        parts = [
+            f"{name}: {stage['count']}x {stage['seconds']:.2f}s"
+            + (f" {stage['bytes'] / 1e6:.1f}MB" if stage["bytes"] else "")
+            for name, stage in sorted(self.stages.items(), key=lambda s: s[1]["seconds"], reverse=True)
+        ]
+        return f"{self.duration:.2f}s total, {len(self.items)} items; " + ", ".join(parts)
+
+
+def _accumulate(stages: dict, span: Span):
+    stage = stages.setdefault(span.name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0, "items": 0})
+    stage["count"] += 1
+    stage["seconds"] += span.duration
+    stage["max_seconds"] = max(stage["max_seconds"], span.duration)
+    stage["bytes"] += span.attributes.get("bytes", 0)
+    stage["items"] += span.attributes.get("count", 0)
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread at a fixed interval.
+
+    The result is written in the folded stack format (``frame;frame;frame count``)
+    understood by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sync-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -1,7 +1,14 @@
+import json
 import os
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
 
+from pydantic import TypeAdapter
 from sqlmodel import create_engine, Session
 
+from .models.sources import DEFAULT_SOURCES, UpstreamSource
+
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./dxmt_mirror.db")
 
 engine = create_engine(DATABASE_URL, echo=True)
@@ -16,3 +23,77 @@ def get_bucket_name() -> str:
 def get_endpoint_url() -> str:
     return os.environ.get("S3_ENDPOINT_URL", None)
 
+def get_sync_profile_dir() -> Optional[str]:
+    # profiling of slow sync cycles is opt-in: it is only enabled when a directory is configured
+    return os.environ.get("SYNC_PROFILE_DIR") or None
+
+def get_sync_profile_threshold() -> float:
+    return float(os.environ.get("SYNC_PROFILE_MIN_SECONDS", "30"))
+
+def get_sync_runs_retention() -> int:
+    return int(os.environ.get("SYNC_RUNS_RETENTION", "500"))
+
+@lru_cache
+def get_sources() -> List[UpstreamSource]:
+    # SYNC_SOURCES_FILE points to a JSON file, SYNC_SOURCES holds the JSON inline
+    raw = None
+    if path := os.environ.get("SYNC_SOURCES_FILE"):
+        raw = Path(path).read_text()
+    elif os.environ.get("SYNC_SOURCES"):
+        raw = os.environ["SYNC_SOURCES"]
+    if raw is None:
+        return DEFAULT_SOURCES
+
+    sources = TypeAdapter(List[UpstreamSource]).validate_python(json.loads(raw))
+    names = [source.name for source in sources]
+    if not sources or len(set(names)) != len(names):
+        raise ValueError(f"Sync sources must be a non-empty list with unique names, got {names}")
+    return sources
+
+def get_source(name: str) -> Optional[UpstreamSource]:
+    return next((source for source in get_sources() if source.name == name), None)
+
+def get_sync_concurrency() -> int:
+    return int(os.environ.get("SYNC_CONCURRENCY", "4"))
+
+def get_sync_interval() -> float:
+    return float(os.environ.get("SYNC_INTERVAL", "60"))
+
+def get_sync_active_interval() -> float:
+    # used instead of SYNC_INTERVAL while a source has CI runs in progress
+    return float(os.environ.get("SYNC_ACTIVE_INTERVAL", "10"))
+
+def get_sync_job_max_attempts() -> int:
+    return int(os.environ.get("SYNC_JOB_MAX_ATTEMPTS", "5"))
+
+def get_sync_job_time_budget() -> float:
+    # seconds a cycle spends on queued jobs before discovering again, so new releases are not stuck behind backfill
+    return float(os.environ.get("SYNC_JOB_TIME_BUDGET", "300"))
+
+def get_verify_batch_size() -> int:
+    # objects checked by the integrity verifier per sync cycle, 0 disables it
+    return int(os.environ.get("VERIFY_BATCH_SIZE", "5000"))
+
+def get_verify_interval() -> float:
+    # hours between the end of one integrity sweep and the start of the next
+    return float(os.environ.get("VERIFY_INTERVAL_HOURS", "24"))
+
+def get_s3_multipart_threshold() -> int:
+    return int(os.environ.get("S3_MULTIPART_THRESHOLD", str(16 * 1024 * 1024)))
+
+def get_s3_multipart_chunksize() -> int:
+    return int(os.environ.get("S3_MULTIPART_CHUNKSIZE", str(16 * 1024 * 1024)))
+
+def get_s3_max_concurrency() -> int:
+    return int(os.environ.get("S3_MAX_CONCURRENCY", "16"))
+
+def get_s3_max_pool_connections() -> int:
+    # the transfer manager opens up to one connection per worker thread
+    return int(os.environ.get("S3_MAX_POOL_CONNECTIONS", str(max(10, get_s3_max_concurrency() * 2))))
+
+def get_s3_checksum_algorithm() -> Optional[str]:
+    # set to an empty string for S3-compatible stores that reject checksum headers
+    return os.environ.get("S3_CHECKSUM_ALGORITHM", "CRC32") or None
+
+def get_publish_manifests() -> bool:
+    return os.environ.get("PUBLISH_MANIFESTS", "1").lower() not in ("0", "false", "no")
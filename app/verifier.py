@@ -0,0 +1,149 @@
+import heapq
+import logging
+from typing import Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import String, cast, collate
+from sqlmodel import Session, select
+
+from .artifact_manager import DXMTArtifactManager
+from .models.builds import BuiltinArtifact, ReleaseArtifact, StagedArtifact
+
+logger = logging.getLogger(__name__)
+
+# the parts of a source's prefix that hold artifact files, in the order S3 lists them.
+# Everything else below the prefix (manifests, other sources) is not checked.
+# section: (catalog model, wow64)
+SECTIONS = {
+    "builtin/": (BuiltinArtifact, False),
+    "release/": (ReleaseArtifact, False),
+    "wow64/builtin/": (BuiltinArtifact, True),
+    "wow64/release/": (ReleaseArtifact, True),
+}
+
+# S3 lists keys in byte order; the catalog has to be read in the same order.
+# SQLite compares strings bytewise already.
+BINARY_COLLATIONS = {"postgresql": "C", "mysql": "utf8mb4_bin"}
+
+ROWS_PER_FETCH = 500
+
+
+class VerifyBatch:
+    def __init__(self):
+        self.checked = 0
+        self.missing: List[Union[BuiltinArtifact, ReleaseArtifact]] = []
+        self.orphaned: List[str] = []
+        # (catalog file, size of the object in the bucket)
+        self.size_mismatched: List[Tuple[Union[BuiltinArtifact, ReleaseArtifact], int]] = []
+        # catalog files whose unknown size was taken from the listing
+        self.backfilled: List[Union[BuiltinArtifact, ReleaseArtifact]] = []
+        self.cursor: Optional[str] = None  # last key checked
+        self.done = False  # the last section was listed to the end
+
+
+class IntegrityVerifier:
+    """Compares a source's catalog with the objects in the bucket.
+
+    The bucket is walked with ListObjectsV2, which returns keys in order along with
+    their sizes, and merged against the catalog rows of the same section, read in key
+    order. No object is HEAD-ed. A check covers at most `budget` objects and resumes
+    after `cursor`, so a sweep over a large bucket is spread across many sync cycles.
+    """
+
+    def __init__(self, session: Session, artifact_manager: DXMTArtifactManager, source: str):
+        self.session = session
+        self.artifact_manager = artifact_manager
+        self.source = source
+        self.prefix = artifact_manager._get_source_prefix(source)
+
+    def _rows(self, model, wow64: bool, start_after: Optional[str]) -> Iterator[tuple]:
+        # (key below the section, row) in key order; the key below a section is "{run id or tag}/{name}"
+        if model is ReleaseArtifact:
+            build = model.build_tag
+        elif model is StagedArtifact:
+            build = cast(model.run_id, String)
+        else:
+            build = cast(model.build_id, String)
+        rest = build + "/" + model.name
+        collation = BINARY_COLLATIONS.get(self.session.get_bind().dialect.name)
+        if collation:
+            rest = collate(rest, collation)
+
+        query = select(rest, model).where(model.source == self.source, model.is_wow64 == wow64)
+        if start_after is not None:
+            query = query.where(rest > start_after)
+        query = query.order_by(rest).execution_options(yield_per=ROWS_PER_FETCH)
+        yield from self.session.exec(query)
+
+    def _expected(self, section: str, start_after: Optional[str]) -> Iterator[tuple]:
+        # (key, catalog file); files staged by in-progress runs come with None, they are neither checked nor orphans
+        model, wow64 = SECTIONS[section]
+        rest_after = start_after[len(self.prefix + section):] if start_after else None
+        streams = [self._rows(model, wow64, rest_after)]
+        if model is BuiltinArtifact:
+            streams.append((rest, None) for rest, _ in self._rows(StagedArtifact, wow64, rest_after))
+        for rest, artifact in heapq.merge(*streams, key=lambda row: row[0]):
+            yield self.prefix + section + rest, artifact
+
+    def _list(self, prefix: str, start_after: Optional[str], limit: int) -> Iterator[dict]:
+        params = {"Bucket": self.artifact_manager.bucket_name, "Prefix": prefix}
+        if start_after:
+            params["StartAfter"] = start_after
+        paginator = self.artifact_manager.s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(**params, PaginationConfig={"MaxItems": limit, "PageSize": min(limit, 1000)})
+        for page in pages:
+            yield from page.get("Contents", [])
+
+    def check(self, cursor: Optional[str], budget: int) -> VerifyBatch:
+        batch = VerifyBatch()
+
+        for section in SECTIONS:
+            section_prefix = self.prefix + section
+            in_section = cursor is not None and cursor.startswith(section_prefix)
+            if cursor is not None and not in_section and cursor > section_prefix:
+                continue  # checked by an earlier batch
+            start_after = cursor if in_section else None
+
+            expected = self._expected(section, start_after)
+            next_key, next_artifact = next(expected, (None, None))
+
+            for obj in self._list(section_prefix, start_after, budget - batch.checked):
+                key = obj["Key"]
+                # catalog keys that sort before the listed key have no object
+                while next_key is not None and next_key < key:
+                    self._missing(batch, next_artifact)
+                    next_key, next_artifact = next(expected, (None, None))
+                if key == next_key:
+                    # a staged file can share its key with a catalog file, consume both
+                    while next_key == key:
+                        self._compare(batch, next_artifact, obj["Size"])
+                        next_key, next_artifact = next(expected, (None, None))
+                else:
+                    batch.orphaned.append(key)
+
+                batch.checked += 1
+                batch.cursor = key
+                if batch.checked >= budget:
+                    return batch
+
+            # the section was listed to the end, the rest of its catalog keys have no object
+            while next_key is not None:
+                self._missing(batch, next_artifact)
+                next_key, next_artifact = next(expected, (None, None))
+
+        batch.done = True
+        return batch
+
+    def _missing(self, batch: VerifyBatch, artifact):
+        if artifact is not None:
+            batch.missing.append(artifact)
+
+    def _compare(self, batch: VerifyBatch, artifact, size: int):
+        if artifact is None:
+            return
+        if artifact.size is None:
+            # mirrored before sizes were recorded, the listing provides it for free
+            artifact.size = size
+            self.session.add(artifact)
+            batch.backfilled.append(artifact)
+        elif artifact.size != size:
+            batch.size_mismatched.append((artifact, size))
@@ -0,0 +1,139 @@
+import argparse
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+from .fake_github import FakeGitHubConfig
+from .report import build_report, compare_reports, format_comparison, load_report, write_report
+
+
+def _add_sync_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("sync")
+    group.add_argument("--runs", type=int, default=60, help="CI runs served for the cold sync")
+    group.add_argument("--releases", type=int, default=5, help="releases served for the cold sync")
+    group.add_argument("--new-runs", type=int, default=10, help="runs added before the incremental sync")
+    group.add_argument("--new-releases", type=int, default=1, help="releases added before the incremental sync")
+    group.add_argument("--files-per-artifact", type=int, default=6)
+    group.add_argument("--file-size", type=int, default=64 * 1024, help="size of every synthetic file in bytes")
+    group.add_argument("--latency-ms", type=float, default=0.0, help="simulated GitHub round trip time")
+    group.add_argument("--rate-limit", type=int, default=None,
+                       help="GitHub requests allowed per --rate-window, announced in X-RateLimit-* headers")
+    group.add_argument("--rate-window", type=float, default=3600.0, help="rate limit window in seconds")
+
+
+def _add_http_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("http")
+    group.add_argument("--builds", type=int, default=5000, help="builtin builds seeded into the catalog")
+    group.add_argument("--catalog-releases", type=int, default=50, help="releases seeded into the catalog")
+    group.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    group.add_argument("--concurrency", type=int, default=32)
+    group.add_argument("--scenario", action="append", dest="scenarios",
+                       help="run only this scenario (list, latest, artifacts, download.builtin, download.release)")
+
+
+def _add_upload_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("upload")
+    group.add_argument("--small-files", type=int, default=200)
+    group.add_argument("--small-size", type=int, default=256 * 1024)
+    group.add_argument("--large-files", type=int, default=2)
+    group.add_argument("--large-size", type=int, default=32 * 1024 * 1024)
+
+
+def _add_startup_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("startup")
+    group.add_argument("--import-runs", type=int, default=5, help="fresh interpreters used to time `import app`")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="DXMT mirror benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("sync", "http", "upload", "startup", "all"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("--output", type=Path, default=Path("bench_report.json"))
+        if name in ("sync", "all"):
+            _add_sync_arguments(sub)
+        if name in ("http", "all"):
+            _add_http_arguments(sub)
+        if name in ("upload", "all"):
+            _add_upload_arguments(sub)
+        if name in ("startup", "all"):
+            _add_startup_arguments(sub)
+
+    compare = subparsers.add_parser("compare", help="compare two reports")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("head", type=Path)
+    compare.add_argument("--json", action="store_true", help="print the comparison as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows = compare_reports(load_report(args.base), load_report(args.head))
+        print(json.dumps(rows, indent=2) if args.json else format_comparison(rows))
+        return
+
+    # the app configures INFO logging on import, which would dominate the timings
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    results = {}
+    config = {}
+
+    if args.command in ("sync", "all"):
+        from .sync_bench import run_sync_benchmarks
+
+        github_config = FakeGitHubConfig(
+            runs=args.runs,
+            releases=args.releases,
+            files_per_artifact=args.files_per_artifact,
+            file_size=args.file_size,
+            latency=args.latency_ms / 1000,
+            rate_limit=args.rate_limit,
+            rate_window=args.rate_window,
+        )
+        config["sync"] = {**asdict(github_config), "new_runs": args.new_runs, "new_releases": args.new_releases}
+        results.update(run_sync_benchmarks(github_config, new_runs=args.new_runs, new_releases=args.new_releases))
+
+    if args.command in ("http", "all"):
+        from .http_bench import run_http_benchmarks
+
+        config["http"] = {
+            "builtin_builds": args.builds,
+            "releases": args.catalog_releases,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "scenarios": args.scenarios,
+        }
+        results.update(run_http_benchmarks(
+            builtin_builds=args.builds,
+            releases=args.catalog_releases,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            scenarios=args.scenarios,
+        ))
+
+    if args.command in ("upload", "all"):
+        from .upload_bench import run_upload_benchmarks
+
+        config["upload"] = {
+            "small_files": args.small_files,
+            "small_size": args.small_size,
+            "large_files": args.large_files,
+            "large_size": args.large_size,
+        }
+        results.update(run_upload_benchmarks(**config["upload"]))
+
+    if args.command in ("startup", "all"):
+        from .startup_bench import run_startup_benchmarks
+
+        config["startup"] = {"import_runs": args.import_runs}
+        results.update(run_startup_benchmarks(import_runs=args.import_runs))
+
+    report = build_report(results, config)
+    write_report(report, args.output)
+    print(json.dumps(results, indent=2))
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
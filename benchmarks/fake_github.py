@@ -0,0 +1,364 @@
+import io
+import json
+import random
+import re
+import tarfile
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class FakeGitHubConfig:
+    owner: str = "3Shain"
+    repo: str = "dxmt"
+    runs: int = 60
+    releases: int = 5
+    files_per_artifact: int = 6
+    file_size: int = 64 * 1024
+    wow64: bool = True
+    # every Nth run is a native build, which the syncer is expected to skip
+    native_every: int = 10
+    # simulated round trip time added to every request, in seconds
+    latency: float = 0.0
+    # requests allowed per rate limit window, announced in X-RateLimit-* headers like GitHub does;
+    # None sends no rate limit headers and never throttles
+    rate_limit: Optional[int] = None
+    rate_window: float = 3600.0
+    seed: int = 1234
+
+
+@dataclass
+class FakeGitHubStats:
+    requests: int = 0
+    api_requests: int = 0
+    downloads: int = 0
+    bytes_served: int = 0
+    # requests answered with 403 because the rate limit was exhausted
+    throttled: int = 0
+    # requests answered with an error injected by FakeGitHub.fail
+    failed: int = 0
+
+
+class FakeGitHub:
+    """A local stand-in for the parts of the GitHub REST API used by the syncer.
+
+    Runs, artifacts and release tarballs are synthetic; payloads are generated once
+    per kind and reused, so serving them is cheap compared to what the syncer does.
+    """
+
+    def __init__(self, config: Optional[FakeGitHubConfig] = None):
+        self.config = config or FakeGitHubConfig()
+        self.stats = FakeGitHubStats()
+        self._lock = threading.Lock()
+        self._runs: list[dict] = []
+        self._artifacts: dict[int, list[dict]] = {}
+        self._releases: list[dict] = []
+        self._assets: dict[int, str] = {}
+        self._payloads: dict[str, bytes] = {}
+        self._next_run_id = 1_000_000
+        self._next_release = 1
+        self._rate_remaining = self.config.rate_limit
+        self._rate_reset = time.time() + self.config.rate_window
+        self._failures: list[list] = []  # [path pattern, remaining count, status]
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.add_runs(self.config.runs)
+        self.add_releases(self.config.releases)
+
+    # ---- synthetic data ----
+
+    def add_runs(self, count: int):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for _ in range(count):
+                run_id = self._next_run_id
+                self._next_run_id += 1
+                index = run_id - 1_000_000
+                is_native = self.config.native_every > 0 and index % self.config.native_every == self.config.native_every - 1
+                sha = f"{run_id:040x}"
+                self._runs.append({
+                    "id": run_id,
+                    "name": "CI",
+                    "head_branch": "main",
+                    "head_sha": sha,
+                    "display_title": f"Synthetic commit {index}",
+                    "status": "completed",
+                    "conclusion": "success",
+                    "updated_at": _isoformat(now),
+                    "created_at": _isoformat(now - timedelta(seconds=1) + timedelta(microseconds=index)),
+                    "run_started_at": _isoformat(now),
+                    "artifacts_url": f"/repos/{self.config.owner}/{self.config.repo}/actions/runs/{run_id}/artifacts",
+                    "workflow_id": 2 if is_native else 1,
+                    "path": ".github/workflows/native.yml" if is_native else ".github/workflows/ci.yml",
+                })
+
+                names = ["dxmt-release", "dxmt-debug", "dxmt-release-gcc"]
+                if self.config.wow64:
+                    names.append("dxmt-release-wow64")
+                self._artifacts[run_id] = [
+                    {
+                        "id": run_id * 10 + i,
+                        "name": name,
+                        "digest": f"sha256:{run_id * 10 + i:064x}",
+                        "expired": False,
+                    }
+                    for i, name in enumerate(names)
+                ]
+            # newest first, like the real API
+            self._runs.sort(key=lambda r: r["id"], reverse=True)
+
+    def add_releases(self, count: int):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for _ in range(count):
+                number = self._next_release
+                self._next_release += 1
+                tag = f"v0.{number}"
+                asset_id = 500_000 + number
+                created = _isoformat(now + timedelta(microseconds=number))
+                self._assets[asset_id] = tag
+                self._releases.append({
+                    "id": 100_000 + number,
+                    "tag_name": tag,
+                    "target_commitish": "main",
+                    "name": tag,
+                    "draft": False,
+                    "prerelease": False,
+                    "created_at": created,
+                    "published_at": created,
+                    "assets": [{
+                        "id": asset_id,
+                        "name": f"dxmt-{tag}.tar.gz",
+                        "content_type": "application/gzip",
+                        "size": 0,
+                        "download_count": 0,
+                        "created_at": created,
+                        "updated_at": created,
+                        "browser_download_url": f"/download/{tag}/dxmt-{tag}.tar.gz",
+                    }],
+                    "body": "",
+                })
+            self._releases.sort(key=lambda r: r["id"], reverse=True)
+
+    def set_run_status(self, run_id: int, status: str, conclusion: Optional[str] = None):
+        """Move a run to another state, e.g. back to in_progress as a re-run does."""
+        with self._lock:
+            run = next(r for r in self._runs if r["id"] == run_id)
+            run["status"] = status
+            run["conclusion"] = conclusion
+            run["updated_at"] = _isoformat(datetime.now(timezone.utc))
+
+    @property
+    def run_ids(self) -> list[int]:
+        return [r["id"] for r in self._runs]
+
+    def _payload(self, kind: str) -> bytes:
+        with self._lock:
+            if kind not in self._payloads:
+                self._payloads[kind] = self._build_payload(kind)
+            return self._payloads[kind]
+
+    def _build_payload(self, kind: str) -> bytes:
+        rng = random.Random(f"{self.config.seed}:{kind}")
+        count = self.config.files_per_artifact
+
+        def files(folder: str, suffixes: list[str]):
+            for i in range(count):
+                suffix = suffixes[i % len(suffixes)]
+                yield f"dxmt/{folder}/file{i}{suffix}", rng.randbytes(self.config.file_size)
+
+        if kind == "release":
+            members = [
+                *files("i386-windows", [".dll"]),
+                *files("x86_64-windows", [".dll"]),
+                *files("x86_64-unix", [".so"]),
+            ]
+            return _make_tarball(members)
+
+        if kind == "wow64":
+            tarball = _make_tarball(files("i386-windows", [".dll"]))
+        else:
+            tarball = _make_tarball(files("x86_64", [".dll", ".so"]))
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("dxmt.tar.gz", tarball)
+        return buffer.getvalue()
+
+    # ---- request handling ----
+
+    def fail(self, pattern: str, times: int = 1, status: int = 500):
+        """Answer the next `times` requests whose path (below the repository) matches `pattern` with `status`."""
+        with self._lock:
+            self._failures.append([re.compile(pattern), times, status])
+
+    def _charge(self) -> tuple[dict[str, str], bool]:
+        # returns the rate limit headers for a request and whether it is throttled
+        if self.config.rate_limit is None:
+            return {}, False
+        with self._lock:
+            now = time.time()
+            if now >= self._rate_reset:
+                self._rate_remaining = self.config.rate_limit
+                self._rate_reset = now + self.config.rate_window
+            throttled = self._rate_remaining <= 0
+            if throttled:
+                self.stats.throttled += 1
+            else:
+                self._rate_remaining -= 1
+            headers = {
+                "X-RateLimit-Limit": str(self.config.rate_limit),
+                "X-RateLimit-Remaining": str(self._rate_remaining),
+                "X-RateLimit-Used": str(self.config.rate_limit - self._rate_remaining),
+                "X-RateLimit-Reset": str(int(self._rate_reset) + 1),
+            }
+            return headers, throttled
+
+    def handle(self, path: str, query: dict[str, list[str]]) -> tuple[int, str, bytes]:
+        prefix = f"/repos/{self.config.owner}/{self.config.repo}"
+        if not path.startswith(prefix):
+            return 404, "application/json", b'{"message": "Not Found"}'
+        path = path[len(prefix):]
+
+        with self._lock:
+            for failure in self._failures:
+                if failure[1] > 0 and failure[0].fullmatch(path):
+                    failure[1] -= 1
+                    self.stats.failed += 1
+                    return failure[2], "application/json", b'{"message": "Injected failure"}'
+
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+
+        if path == "/actions/runs":
+            runs = self._runs
+            status = query.get("status", [None])[0]
+            if status == "success":
+                runs = [r for r in runs if r["conclusion"] == "success"]
+            elif status:
+                runs = [r for r in runs if r["status"] == status]
+            items = _paginate(runs, page, per_page)
+            return _json({"total_count": len(runs), "workflow_runs": items})
+
+        if match := re.fullmatch(r"/actions/runs/(\d+)", path):
+            run = next((r for r in self._runs if r["id"] == int(match.group(1))), None)
+            if run is None:
+                return 404, "application/json", b'{"message": "Not Found"}'
+            return _json(run)
+
+        if match := re.fullmatch(r"/actions/runs/(\d+)/artifacts", path):
+            artifacts = self._artifacts.get(int(match.group(1)), [])
+            return _json({"total_count": len(artifacts), "artifacts": _paginate(artifacts, page, per_page)})
+
+        if match := re.fullmatch(r"/actions/artifacts/(\d+)/zip", path):
+            artifact_id = int(match.group(1))
+            name = next(
+                (a["name"] for a in self._artifacts.get(artifact_id // 10, []) if a["id"] == artifact_id),
+                None,
+            )
+            if name is None:
+                return 404, "application/json", b'{"message": "Not Found"}'
+            kind = "wow64" if "wow64" in name else "artifact"
+            return 200, "application/zip", self._payload(kind)
+
+        if path == "/releases":
+            return _json(_paginate(self._releases, page, per_page))
+
+        if match := re.fullmatch(r"/releases/assets/(\d+)", path):
+            if int(match.group(1)) not in self._assets:
+                return 404, "application/json", b'{"message": "Not Found"}'
+            return 200, "application/octet-stream", self._payload("release")
+
+        return 404, "application/json", b'{"message": "Not Found"}'
+
+    # ---- server lifecycle ----
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Fake GitHub server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if fake.config.latency:
+                    time.sleep(fake.config.latency)
+                parsed = urlparse(self.path)
+                rate_headers, throttled = fake._charge()
+                if throttled:
+                    status, content_type = 403, "application/json"
+                    body = b'{"message": "API rate limit exceeded"}'
+                else:
+                    status, content_type, body = fake.handle(parsed.path, parse_qs(parsed.query))
+                with fake._lock:
+                    fake.stats.requests += 1
+                    fake.stats.bytes_served += len(body)
+                    if content_type == "application/json":
+                        fake.stats.api_requests += 1
+                    else:
+                        fake.stats.downloads += 1
+                self.send_response(status)
+                for name, value in rate_headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _isoformat(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _paginate(items: list, page: int, per_page: int) -> list:
+    start = (page - 1) * per_page
+    return items[start:start + per_page]
+
+
+def _json(payload) -> tuple[int, str, bytes]:
+    return 200, "application/json", json.dumps(payload).encode()
+
+
+def _make_tarball(members) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=1) as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
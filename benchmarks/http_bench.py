@@ -0,0 +1,162 @@
+import asyncio
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from sqlmodel import Session, create_engine
+
+from app.router import router, artifact_router, build_router
+from app.utils import get_db
+
+from .local_s3 import LocalS3
+from .seed import seed_catalog
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _build_app(engine) -> FastAPI:
+    # same routes as app.app, without the lifespan that starts the syncer
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(artifact_router)
+    app.include_router(build_router)
+
+    def get_bench_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_bench_db
+    return app
+
+
+class _Server:
+    def __init__(self, app: FastAPI):
+        self.port = _free_port()
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def _scenarios(catalog: dict, pages: int) -> dict[str, Callable[[random.Random], str]]:
+    run_ids = catalog["run_ids"]
+    tags = catalog["tags"]
+
+    return {
+        "list": lambda rng: f"/builds/list?page={rng.randint(1, pages)}&page_size=10",
+        # there is no dedicated latest route, clients ask for the first entry of the list
+        "latest": lambda rng: "/builds/list?page=1&page_size=1",
+        "artifacts": lambda rng: f"/artifacts/list?id={rng.choice(run_ids)}",
+        "download.builtin": lambda rng: (
+            f"/builds/download/{rng.choice(run_ids)}/artifact/{rng.choice(catalog['builtin_files'])}"
+        ),
+        "download.release": lambda rng: (
+            f"/artifacts/download/{rng.choice(tags)}/artifact/{rng.choice(catalog['release_files'])}"
+        ),
+    }
+
+
+async def _load(base_url: str, make_path: Callable[[random.Random], str], requests: int, concurrency: int, seed: int) -> dict:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    errors = 0
+    remaining = requests
+
+    async def worker(index: int, client: httpx.AsyncClient):
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + index)
+        while remaining > 0:
+            remaining -= 1
+            path = make_path(rng)
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, follow_redirects=False, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i, client) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "latency_ms_mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "latency_ms_p50": percentile(0.50),
+        "latency_ms_p90": percentile(0.90),
+        "latency_ms_p99": percentile(0.99),
+        "latency_ms_max": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def run_http_benchmarks(
+    builtin_builds: int = 5000,
+    releases: int = 50,
+    requests: int = 2000,
+    concurrency: int = 32,
+    scenarios: list[str] | None = None,
+    seed: int = 1234,
+) -> dict:
+    """Seed a catalog, serve the API routers with uvicorn and drive each scenario with concurrent clients."""
+    with LocalS3() as _, tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(f"sqlite:///{Path(temp_dir) / 'bench.db'}")
+        start = time.perf_counter()
+        catalog = seed_catalog(engine, builtin_builds=builtin_builds, releases=releases)
+        seed_seconds = time.perf_counter() - start
+
+        available = _scenarios(catalog, pages=max(1, (builtin_builds + releases) // 10))
+        selected = scenarios or list(available)
+
+        results = {"http.seed": {"seconds": seed_seconds, "builtin_builds": builtin_builds, "releases": releases}}
+        with _Server(_build_app(engine)) as server:
+            for name in selected:
+                results[f"http.{name}"] = asyncio.run(
+                    _load(server.url, available[name], requests, concurrency, seed)
+                )
+
+        engine.dispose()
+
+    return results
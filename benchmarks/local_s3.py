@@ -0,0 +1,72 @@
+import os
+from typing import Optional
+
+import boto3
+
+
+class LocalS3:
+    """Runs a moto S3 server in-process and points the app's S3 settings at it."""
+
+    def __init__(self, bucket_name: str = "dxmt-bench"):
+        self.bucket_name = bucket_name
+        self._server = None
+        self._saved_env: dict[str, Optional[str]] = {}
+        self.endpoint_url: Optional[str] = None
+
+    def start(self):
+        # moto is only needed for benchmarks, keep it out of the runtime import path
+        from moto.server import ThreadedMotoServer
+
+        self._server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+        self._server.start()
+        host, port = self._server.get_host_and_port()
+        self.endpoint_url = f"http://{host}:{port}"
+
+        env = {
+            "AWS_ACCESS_KEY_ID": "bench",
+            "AWS_SECRET_ACCESS_KEY": "bench",
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "S3_ENDPOINT_URL": self.endpoint_url,
+            "S3_BUCKET_NAME": self.bucket_name,
+        }
+        for key, value in env.items():
+            self._saved_env[key] = os.environ.get(key)
+            os.environ[key] = value
+
+        self.client().create_bucket(Bucket=self.bucket_name)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env = {}
+
+    def client(self):
+        return boto3.client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            config=boto3.session.Config(s3={"addressing_style": "path"}),
+        )
+
+    def object_stats(self) -> tuple[int, int]:
+        """Return (object count, total bytes) currently stored in the bucket."""
+        count = 0
+        size = 0
+        paginator = self.client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name):
+            for obj in page.get("Contents", []):
+                count += 1
+                size += obj["Size"]
+        return count, size
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
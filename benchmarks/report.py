@@ -0,0 +1,76 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+REPORT_VERSION = 1
+
+# metrics where a smaller number is an improvement
+LOWER_IS_BETTER = ("seconds", "latency_ms", "errors", "github_requests")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: dict, config: dict) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+
+
+def write_report(report: dict, path: Path):
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+def load_report(path: Path) -> dict:
+    report = json.loads(path.read_text())
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"Unsupported report version in {path}: {report.get('version')}")
+    return report
+
+
+def compare_reports(base: dict, head: dict) -> list[dict]:
+    """Pair up every numeric metric present in both reports and compute the relative change."""
+    rows = []
+    for name, head_metrics in head["results"].items():
+        base_metrics = base["results"].get(name)
+        if not base_metrics:
+            continue
+        for metric, head_value in head_metrics.items():
+            base_value = base_metrics.get(metric)
+            if not isinstance(head_value, (int, float)) or not isinstance(base_value, (int, float)):
+                continue
+            change = (head_value - base_value) / base_value if base_value else None
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "base": base_value,
+                "head": head_value,
+                "change": change,
+                "lower_is_better": metric.startswith(LOWER_IS_BETTER),
+            })
+    return rows
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = [f"{'benchmark':<22} {'metric':<20} {'base':>14} {'head':>14} {'change':>9}"]
+    for row in rows:
+        change = "n/a" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(
+            f"{row['benchmark']:<22} {row['metric']:<20} {row['base']:>14.3f} {row['head']:>14.3f} {change:>9}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.migrations import migrate
+from app.models.builds import BuiltinBuild, ReleaseBuild, BuiltinArtifact, ReleaseArtifact
+
+BUILTIN_FILES = ["d3d10core.dll", "d3d11.dll", "dxgi.dll", "winemetal.dll", "winemetal.so", "nvngx.dll"]
+RELEASE_FILES = ["d3d10core.dll", "d3d11.dll", "dxgi.dll", "winemetal.dll", "winemetal.so"]
+
+
+def seed_catalog(engine, builtin_builds: int = 5000, releases: int = 50, batch_size: int = 500) -> dict:
+    """Fill the catalog with synthetic builds and return the identifiers load tests can target."""
+    migrate(engine)
+    now = datetime.now(timezone.utc)
+    run_ids = []
+    tags = []
+
+    with Session(engine) as session:
+        for i in range(builtin_builds):
+            run_id = 1_000_000 + i
+            run_ids.append(run_id)
+            session.add(BuiltinBuild(
+                github_run_id=run_id,
+                commit_sha=f"{run_id:040x}",
+                description=f"Synthetic commit {i}",
+                created_at=now - timedelta(minutes=builtin_builds - i),
+                artifact_count=len(BUILTIN_FILES) + 3,
+                has_wow64=True,
+            ))
+            for name in BUILTIN_FILES:
+                session.add(BuiltinArtifact(artifact_id=run_id * 10, build_id=run_id, name=name, is_wow64=False))
+            for name in BUILTIN_FILES[:3]:
+                session.add(BuiltinArtifact(artifact_id=run_id * 10 + 1, build_id=run_id, name=name, is_wow64=True))
+            if (i + 1) % batch_size == 0:
+                session.commit()
+
+        for i in range(releases):
+            tag = f"v0.{i + 1}"
+            tags.append(tag)
+            session.add(ReleaseBuild(
+                tag=tag,
+                created_at=now - timedelta(days=releases - i, seconds=30),
+                artifact_count=len(RELEASE_FILES) + sum(name.endswith(".dll") for name in RELEASE_FILES),
+                has_wow64=True,
+            ))
+            for name in RELEASE_FILES:
+                session.add(ReleaseArtifact(build_tag=tag, name=name, is_wow64=False))
+                if name.endswith(".dll"):
+                    session.add(ReleaseArtifact(build_tag=tag, name=name, is_wow64=True))
+        session.commit()
+
+    return {"run_ids": run_ids, "tags": tags, "builtin_files": BUILTIN_FILES, "release_files": RELEASE_FILES}
@@ -0,0 +1,90 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .fake_github import FakeGitHub, FakeGitHubConfig
+from .http_bench import _free_port
+from .local_s3 import LocalS3
+
+ROOT = Path(__file__).resolve().parents[1]
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _import_time(runs: int, top: int) -> dict:
+    """Time `import app` in fresh interpreters and list the slowest top-level imports."""
+    durations = []
+    cumulative: dict[str, list[int]] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        durations.append(time.perf_counter() - start)
+        for match in IMPORTTIME_LINE.finditer(result.stderr):
+            # modules imported directly by the app package (importtime indents two spaces per
+            # level); deeper ones are already part of their parent's cumulative time
+            if len(match.group(3)) == 3:
+                cumulative.setdefault(match.group(4), []).append(int(match.group(2)))
+
+    slowest = sorted(
+        ((name, statistics.median(values) / 1000) for name, values in cumulative.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    return {
+        "seconds": statistics.median(durations),
+        "seconds_min": min(durations),
+        "runs": runs,
+        "slowest_imports_ms": dict(slowest),
+    }
+
+
+def _time_to_ready(timeout: float = 60) -> dict:
+    """Start the full app with uvicorn and time how long until it is live and ready."""
+    with FakeGitHub(FakeGitHubConfig(runs=0, releases=0)) as github, LocalS3(), tempfile.TemporaryDirectory() as temp_dir:
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(temp_dir) / 'startup.db'}",
+            "GITHUB_TOKEN": "bench",
+            "GITHUB_API_URL": github.url,
+            "PUBLISH_MANIFESTS": "0",
+        }
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        live = ready = None
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+                while ready is None and time.perf_counter() - start < timeout:
+                    try:
+                        if live is None and client.get("/health/live").status_code == 200:
+                            live = time.perf_counter() - start
+                        if live is not None and client.get("/health/ready").status_code == 200:
+                            ready = time.perf_counter() - start
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.01)
+        finally:
+            process.terminate()
+            process.wait()
+
+    if ready is None:
+        raise RuntimeError(f"App did not become ready within {timeout}s")
+    return {"live_seconds": live, "ready_seconds": ready}
+
+
+def run_startup_benchmarks(import_runs: int = 5, top: int = 10) -> dict:
+    return {
+        "startup.import": _import_time(import_runs, top),
+        "startup.server": _time_to_ready(),
+    }
@@ -0,0 +1,71 @@
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import create_engine
+
+from app.github import GitHubAPIClient
+from app.migrations import migrate
+from app.models.sources import DEFAULT_SOURCE, UpstreamSource
+from app.syncer import ArtifactSyncer
+
+from .fake_github import FakeGitHub, FakeGitHubConfig
+from .local_s3 import LocalS3
+
+
+def _timed_cycle(syncer: ArtifactSyncer, github: FakeGitHub, s3: LocalS3) -> dict:
+    requests_before = github.stats.requests
+    throttled_before = github.stats.throttled
+    downloaded_before = github.stats.bytes_served
+    objects_before, stored_before = s3.object_stats()
+
+    start = time.perf_counter()
+    syncer._run_sync_cycle()
+    elapsed = time.perf_counter() - start
+
+    objects_after, stored_after = s3.object_stats()
+    downloaded = github.stats.bytes_served - downloaded_before
+    uploaded = stored_after - stored_before
+    return {
+        "seconds": elapsed,
+        "github_requests": github.stats.requests - requests_before,
+        # must stay 0: the rate budget paces requests before GitHub has to refuse them
+        "github_throttled": github.stats.throttled - throttled_before,
+        "bytes_downloaded": downloaded,
+        "objects_uploaded": objects_after - objects_before,
+        "bytes_uploaded": uploaded,
+        "download_mb_per_s": downloaded / elapsed / 1e6 if elapsed else 0.0,
+        "upload_mb_per_s": uploaded / elapsed / 1e6 if elapsed else 0.0,
+        "objects_per_s": (objects_after - objects_before) / elapsed if elapsed else 0.0,
+        "stages": syncer.trace.stages,
+    }
+
+
+def run_sync_benchmarks(config: FakeGitHubConfig, new_runs: int = 10, new_releases: int = 1) -> dict:
+    """Measure a cold catch-up sync, an incremental sync, and a sync with nothing to do."""
+    with FakeGitHub(config) as github, LocalS3() as s3, tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(f"sqlite:///{Path(temp_dir) / 'bench.db'}")
+        migrate(engine)
+        client = GitHubAPIClient(token="bench", base_url=github.url)
+        source = UpstreamSource(name=DEFAULT_SOURCE, owner=config.owner, repo=config.repo)
+        syncer = ArtifactSyncer(client, engine, s3.bucket_name, source)
+
+        cold = _timed_cycle(syncer, github, s3)
+        cold["runs"] = config.runs
+        cold["releases"] = config.releases
+
+        github.add_runs(new_runs)
+        github.add_releases(new_releases)
+        incremental = _timed_cycle(syncer, github, s3)
+        incremental["runs"] = new_runs
+        incremental["releases"] = new_releases
+
+        noop = _timed_cycle(syncer, github, s3)
+
+        engine.dispose()
+
+    return {
+        "sync.cold": cold,
+        "sync.incremental": incremental,
+        "sync.noop": noop,
+    }
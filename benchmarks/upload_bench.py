@@ -0,0 +1,62 @@
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.artifact_manager import DXMTArtifactManager
+
+from .local_s3 import LocalS3
+
+
+def _write_files(directory: Path, prefix: str, count: int, size: int, seed: int) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = directory / f"{prefix}{i}.bin"
+        path.write_bytes(rng.randbytes(size))
+        paths.append(path)
+    return paths
+
+
+def _result(seconds: float, paths: list[Path]) -> dict:
+    size = sum(path.stat().st_size for path in paths)
+    return {
+        "seconds": seconds,
+        "objects": len(paths),
+        "bytes": size,
+        "objects_per_s": len(paths) / seconds if seconds else 0.0,
+        "mb_per_s": size / seconds / 1e6 if seconds else 0.0,
+    }
+
+
+def run_upload_benchmarks(
+    small_files: int = 200,
+    small_size: int = 256 * 1024,
+    large_files: int = 2,
+    large_size: int = 32 * 1024 * 1024,
+    seed: int = 1234,
+) -> dict:
+    """Compare one-at-a-time upload_file calls with default settings to the batched upload service."""
+    results = {}
+    with LocalS3() as s3, tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        workloads = {
+            "small": _write_files(temp_path, "small", small_files, small_size, seed),
+            "large": _write_files(temp_path, "large", large_files, large_size, seed + 1),
+        }
+
+        # what the syncer did before: a default client and TransferConfig, one file after another
+        client = s3.client()
+        for name, paths in workloads.items():
+            start = time.perf_counter()
+            for path in paths:
+                client.upload_file(str(path), s3.bucket_name, f"sequential/{path.name}")
+            results[f"upload.sequential.{name}"] = _result(time.perf_counter() - start, paths)
+
+        manager = DXMTArtifactManager(None, s3.bucket_name, endpoint_url=s3.endpoint_url)
+        for name, paths in workloads.items():
+            start = time.perf_counter()
+            manager.upload_service.upload_files([(path, f"batched/{path.name}") for path in paths])
+            results[f"upload.batched.{name}"] = _result(time.perf_counter() - start, paths)
+
+    return results
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import Session, create_engine, select
+
+from app.migrations import LATEST_VERSION, SCHEMA_VERSION_TABLE, migrate
+from app.models.builds import BuiltinArtifact, ReleaseArtifact, ReleaseBuild
+from app.models.sources import DEFAULT_SOURCE
+
+# the schema create_all produced before migrations existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE builtinbuild (
+        github_run_id INTEGER NOT NULL PRIMARY KEY, commit_sha VARCHAR NOT NULL, description VARCHAR NOT NULL,
+        created_at DATETIME NOT NULL, artifact_count INTEGER NOT NULL, has_wow64 BOOLEAN NOT NULL)""",
+    "CREATE INDEX ix_builtinbuild_commit_sha ON builtinbuild (commit_sha)",
+    "CREATE INDEX ix_builtinbuild_created_at ON builtinbuild (created_at)",
+    """CREATE TABLE releasebuild (
+        tag VARCHAR NOT NULL PRIMARY KEY, created_at DATETIME NOT NULL, artifact_count INTEGER NOT NULL,
+        has_wow64 BOOLEAN NOT NULL)""",
+    "CREATE INDEX ix_releasebuild_tag ON releasebuild (tag)",
+    "CREATE INDEX ix_releasebuild_created_at ON releasebuild (created_at)",
+    """CREATE TABLE builtinartifact (
+        id INTEGER NOT NULL PRIMARY KEY, artifact_id INTEGER NOT NULL,
+        build_id INTEGER NOT NULL REFERENCES builtinbuild (github_run_id), name VARCHAR NOT NULL,
+        is_wow64 BOOLEAN NOT NULL)""",
+    "CREATE INDEX ix_builtinartifact_artifact_id ON builtinartifact (artifact_id)",
+    "CREATE INDEX ix_builtinartifact_build_id ON builtinartifact (build_id)",
+    """CREATE TABLE releaseartifact (
+        id INTEGER NOT NULL PRIMARY KEY, build_tag VARCHAR NOT NULL REFERENCES releasebuild (tag),
+        name VARCHAR NOT NULL, is_wow64 BOOLEAN NOT NULL)""",
+    "CREATE INDEX ix_releaseartifact_build_tag ON releaseartifact (build_tag)",
+    "INSERT INTO builtinbuild VALUES (100, 'abc', 'build', '2025-01-01 00:00:00', 1, 0)",
+    "INSERT INTO builtinartifact VALUES (1, 7, 100, 'd3d11.dll', 0)",
+    "INSERT INTO releasebuild VALUES ('v0.1', '2025-01-02 00:00:00', 2, 1)",
+    "INSERT INTO releaseartifact VALUES (1, 'v0.1', 'd3d11.dll', 0)",
+    "INSERT INTO releaseartifact VALUES (5, 'v0.1', 'd3d11.dll', 1)",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _version(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")).scalar_one()
+
+
+def test_upgrades_baseline_database(engine):
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+
+    migrate(engine)
+
+    assert _version(engine) == LATEST_VERSION
+    assert {"syncrun", "stagedartifact", "integritysweep", "syncjob"} <= set(inspect(engine).get_table_names())
+    with Session(engine) as session:
+        artifact = session.exec(select(BuiltinArtifact)).one()
+        assert (artifact.source, artifact.build_id, artifact.size) == (DEFAULT_SOURCE, 100, None)
+
+        release = session.get(ReleaseBuild, (DEFAULT_SOURCE, "v0.1"))
+        assert release is not None and release.has_wow64
+        assert [a.id for a in release.artifacts] == [1, 5]
+
+        # new rows must not collide with the ids carried over from the old table
+        session.add(ReleaseArtifact(source=DEFAULT_SOURCE, build_tag="v0.1", name="dxgi.dll"))
+        session.commit()
+        assert session.exec(select(ReleaseArtifact).where(ReleaseArtifact.name == "dxgi.dll")).one().id == 6
+
+
+@pytest.mark.parametrize("baseline", [False, True], ids=["fresh", "baseline"])
+def test_concurrent_replicas_migrate_once(engine, baseline):
+    if baseline:
+        with engine.begin() as conn:
+            for statement in BASELINE_SCHEMA:
+                conn.execute(text(statement))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for future in [pool.submit(migrate, engine) for _ in range(4)]:
+            future.result()
+
+    assert _version(engine) == LATEST_VERSION
+    with engine.connect() as conn:
+        assert conn.execute(text(f"SELECT COUNT(*) FROM {SCHEMA_VERSION_TABLE}")).scalar_one() == 1
+        assert conn.execute(text("SELECT COUNT(*) FROM releaseartifact")).scalar_one() == (2 if baseline else 0)
+
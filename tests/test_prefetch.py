@@ -0,0 +1,77 @@
+import pytest
+from sqlmodel import Session, create_engine, select
+
+from app.artifact_manager import DXMTArtifactManager
+from app.github import GitHubAPIClient
+from app.migrations import migrate
+from app.models.builds import BuiltinBuild, StagedArtifact
+from app.models.sources import UpstreamSource
+from app.syncer import ArtifactSyncer
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig
+from benchmarks.local_s3 import LocalS3
+
+
+@pytest.fixture
+def github():
+    with FakeGitHub(FakeGitHubConfig(runs=1, releases=0)) as github:
+        yield github
+
+
+@pytest.fixture
+def s3():
+    with LocalS3() as s3:
+        yield s3
+
+
+@pytest.fixture
+def syncer(github, s3, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrate(engine)
+    client = GitHubAPIClient(token="test", base_url=github.url)
+    source = UpstreamSource(name="dxmt", owner=github.config.owner, repo=github.config.repo)
+    yield ArtifactSyncer(client, engine, s3.bucket_name, source)
+    engine.dispose()
+
+
+def _build_objects(s3: LocalS3, run_id: int) -> dict:
+    objects = {}
+    for prefix in ("dxmt-artifacts/builtin/", "dxmt-artifacts/wow64/builtin/"):
+        response = s3.client().list_objects_v2(Bucket=s3.bucket_name, Prefix=f"{prefix}{run_id}/")
+        objects.update({obj["Key"]: obj["ETag"] for obj in response.get("Contents", [])})
+    return objects
+
+
+def test_rerun_of_mirrored_build_keeps_its_files(syncer, github, s3):
+    run_id = github.run_ids[0]
+    syncer._run_sync_cycle()
+    published = _build_objects(s3, run_id)
+    assert published
+    downloads = github.stats.downloads
+
+    github.set_run_status(run_id, "in_progress")
+    syncer._run_sync_cycle()
+    with Session(syncer.engine) as session:
+        assert not session.exec(select(StagedArtifact)).all()
+    assert github.stats.downloads == downloads
+
+    github.set_run_status(run_id, "completed", "cancelled")
+    syncer._run_sync_cycle()
+    assert _build_objects(s3, run_id) == published
+    with Session(syncer.engine) as session:
+        assert len(session.get(BuiltinBuild, run_id).artifacts) == len(published)
+
+
+def test_discard_spares_files_of_a_published_build(syncer, github, s3):
+    run_id = github.run_ids[0]
+    syncer._run_sync_cycle()
+    published = _build_objects(s3, run_id)
+
+    with Session(syncer.engine) as session:
+        # left over from a re-run staged before its build was checked
+        for artifact in session.get(BuiltinBuild, run_id).artifacts:
+            session.add(StagedArtifact.from_builtin_artifact(artifact))
+        session.commit()
+
+        syncer._discard_staged_run(run_id, session, DXMTArtifactManager(session, s3.bucket_name, endpoint_url=s3.endpoint_url))
+        assert not session.exec(select(StagedArtifact)).all()
+    assert _build_objects(s3, run_id) == published
@@ -0,0 +1,70 @@
+import time
+
+from app.github import GitHubAPIClient, RateBudget
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig
+
+
+class FakeResponse:
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+def _window(budget: RateBudget, limit: int, remaining: int, reset_in: float):
+    budget.update(FakeResponse({
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(time.time() + reset_in),
+    }))
+
+
+def _timed_acquires(budget: RateBudget, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        budget.acquire()
+    return time.perf_counter() - start
+
+
+def test_unknown_budget_is_not_paced():
+    budget = RateBudget(reserve=10, burst=1)
+    assert _timed_acquires(budget, 50) < 0.1
+    assert budget.usable_fraction() == 1.0
+
+
+def test_burst_then_paced_to_the_window():
+    budget = RateBudget(reserve=0, burst=3)
+    # 10 requests left for 2 seconds: 5 per second once the burst is spent
+    _window(budget, limit=100, remaining=10, reset_in=2)
+    assert _timed_acquires(budget, 3) < 0.1
+    elapsed = _timed_acquires(budget, 3)
+    assert 0.3 < elapsed < 1.5
+    assert budget.remaining == 4
+
+
+def test_waits_for_reset_at_reserve():
+    budget = RateBudget(reserve=5, burst=10)
+    _window(budget, limit=100, remaining=5, reset_in=0.5)
+    assert _timed_acquires(budget, 1) >= 0.4
+
+
+def test_retry_after_blocks():
+    budget = RateBudget(reserve=0, burst=10)
+    budget.update(FakeResponse({"Retry-After": "0.3"}))
+    assert _timed_acquires(budget, 1) >= 0.25
+
+
+def test_usable_fraction():
+    budget = RateBudget(reserve=10, burst=10)
+    _window(budget, limit=110, remaining=60, reset_in=60)
+    assert budget.usable_fraction() == 0.5
+    _window(budget, limit=110, remaining=5, reset_in=60)
+    assert budget.usable_fraction() == 0.0
+
+
+def test_client_stays_within_fake_rate_limit():
+    config = FakeGitHubConfig(runs=5, releases=0, rate_limit=20, rate_window=1.0)
+    with FakeGitHub(config) as github:
+        client = GitHubAPIClient(token="test", base_url=github.url, rate_budget=RateBudget(reserve=0, burst=5))
+        for _ in range(40):
+            client.get_action_runs(config.owner, config.repo)
+        assert github.stats.throttled == 0
+        assert github.stats.requests == 40
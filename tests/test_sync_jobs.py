@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import Session, create_engine
+
+from app.artifact_manager import DXMTArtifactManager
+from app.github import GitHubAPIClient, RateBudget
+from app.migrations import migrate
+from app.models.sources import UpstreamSource
+from app.models.sync import SyncJob
+from app.syncer import JOB_BACKOFF_MAX, PRIORITY_BACKFILL, PRIORITY_NEW_RUN, ArtifactSyncer
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig
+
+# a run the fake API has no artifacts for: processing it succeeds without touching S3
+EMPTY_RUN_ID = 42
+
+
+@pytest.fixture
+def github():
+    with FakeGitHub(FakeGitHubConfig(runs=0, releases=0)) as github:
+        yield github
+
+
+@pytest.fixture
+def syncer(github, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrate(engine)
+    client = GitHubAPIClient(token="test", base_url=github.url, rate_budget=RateBudget(reserve=10, burst=10))
+    source = UpstreamSource(name="dxmt", owner=github.config.owner, repo=github.config.repo)
+    yield ArtifactSyncer(client, engine, "bucket", source)
+    engine.dispose()
+
+
+def _run_payload(run_id: int) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": run_id, "name": "build", "head_branch": "main", "head_sha": "abc", "display_title": "test",
+        "status": "completed", "conclusion": "success", "updated_at": now, "created_at": now,
+        "run_started_at": now, "artifacts_url": "", "workflow_id": 1, "path": ".github/workflows/ci.yml",
+    }
+
+
+def _add_job(session: Session, run_id: int, priority: int = PRIORITY_NEW_RUN) -> int:
+    job = SyncJob(
+        source="dxmt",
+        kind="builtin",
+        target=str(run_id),
+        priority=priority,
+        upstream_created_at=datetime.now(timezone.utc),
+        next_attempt_at=datetime.now(timezone.utc),
+        payload=_run_payload(run_id),
+    )
+    session.add(job)
+    session.commit()
+    return job.id
+
+
+def _utcnow() -> datetime:
+    # SQLite hands datetimes back without a timezone
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_failed_job_keeps_being_retried(syncer, github, monkeypatch):
+    monkeypatch.setenv("SYNC_JOB_MAX_ATTEMPTS", "2")
+    github.fail(rf"/actions/runs/{EMPTY_RUN_ID}/artifacts", times=3)
+    with Session(syncer.engine) as session:
+        manager = DXMTArtifactManager(session, "bucket")
+        job_id = _add_job(session, EMPTY_RUN_ID)
+
+        syncer._run_job(session.get(SyncJob, job_id), session, manager)
+        job = session.get(SyncJob, job_id)
+        assert (job.status, job.attempts) == ("pending", 1)
+        assert "500" in job.last_error
+        # first backoff is a minute, with jitter
+        assert _utcnow() + timedelta(seconds=40) < job.next_attempt_at < _utcnow() + timedelta(seconds=80)
+
+        syncer._run_job(job, session, manager)
+        job = session.get(SyncJob, job_id)
+        assert (job.status, job.attempts) == ("failed", 2)
+        assert _utcnow() + timedelta(seconds=90) < job.next_attempt_at < _utcnow() + timedelta(seconds=150)
+
+        # once due, a failed job is dispatched like any other
+        job.next_attempt_at = datetime.now(timezone.utc)
+        session.add(job)
+        session.commit()
+        syncer.dispatch_jobs(session, manager)
+        assert (job.status, job.attempts) == ("failed", 3)
+
+        job.next_attempt_at = datetime.now(timezone.utc)
+        session.add(job)
+        session.commit()
+        syncer.dispatch_jobs(session, manager)
+        assert (job.status, job.last_error) == ("done", None)
+
+
+def test_backoff_is_capped(syncer, github):
+    github.fail(rf"/actions/runs/{EMPTY_RUN_ID}/artifacts", times=1)
+    with Session(syncer.engine) as session:
+        job_id = _add_job(session, EMPTY_RUN_ID)
+        job = session.get(SyncJob, job_id)
+        job.attempts = 20
+        syncer._run_job(job, session, DXMTArtifactManager(session, "bucket"))
+        job = session.get(SyncJob, job_id)
+        assert job.next_attempt_at < _utcnow() + JOB_BACKOFF_MAX * 1.2 + timedelta(seconds=1)
+
+
+def test_successful_retry_clears_the_error(syncer, github):
+    github.fail(rf"/actions/runs/{EMPTY_RUN_ID}/artifacts", times=1)
+    with Session(syncer.engine) as session:
+        manager = DXMTArtifactManager(session, "bucket")
+        job_id = _add_job(session, EMPTY_RUN_ID)
+
+        syncer._run_job(session.get(SyncJob, job_id), session, manager)
+        syncer._run_job(session.get(SyncJob, job_id), session, manager)
+        job = session.get(SyncJob, job_id)
+        assert (job.status, job.attempts, job.last_error) == ("done", 1, None)
+
+
+def test_backfill_waits_while_rate_budget_is_low(syncer):
+    budget = syncer.github_client.rate_budget
+    with Session(syncer.engine) as session:
+        manager = DXMTArtifactManager(session, "bucket")
+        new_id = _add_job(session, EMPTY_RUN_ID, PRIORITY_NEW_RUN)
+        backfill_id = _add_job(session, EMPTY_RUN_ID + 1, PRIORITY_BACKFILL)
+
+        # a tenth of the budget above the reserve is left
+        budget._limit, budget.remaining, budget.reset_at = 110, 20, datetime.now().timestamp() + 3600
+        syncer.dispatch_jobs(session, manager)
+        assert session.get(SyncJob, new_id).status == "done"
+        assert session.get(SyncJob, backfill_id).status == "pending"
+
+        budget.remaining = 100
+        syncer.dispatch_jobs(session, manager)
+        assert session.get(SyncJob, backfill_id).status == "done"